@@ -6,16 +6,16 @@ This script scrapes S&P 500 stock data from Stooq.com and exports it to CSV form
 """
 
 import argparse
+import asyncio
 import sys
 import signal
+import threading
 from pathlib import Path
 
 # Add src to path for imports
 sys.path.insert(0, str(Path(__file__).parent / "src"))
 
 from src.config.manager import ConfigManager
-from src.scraper.stooq_scraper import StooqScraper
-from src.exporters.csv_exporter import CSVExporter
 from src.utils.logger import ScraperLogger
 from src.utils.errors import ScrapingError, ConfigurationError, ExportError
 
@@ -29,8 +29,13 @@ class StooqScraperApp:
         self.scraper = None
         self.exporter = None
         self.shutdown_requested = False
+    
+    def _install_signal_handlers(self):
+        """Setup signal handlers for graceful shutdown"""
+        # Signal handlers can only be installed from the main thread
+        if threading.current_thread() is not threading.main_thread():
+            return
         
-        # Setup signal handlers for graceful shutdown
         signal.signal(signal.SIGINT, self._signal_handler)
         signal.signal(signal.SIGTERM, self._signal_handler)
     
@@ -47,6 +52,8 @@ class StooqScraperApp:
     
     def run(self, args):
         """Main application entry point"""
+        self._install_signal_handlers()
+        
         try:
             # Initialize components
             self._initialize_config(args)
@@ -71,7 +78,7 @@ class StooqScraperApp:
             
             # End session and show results
             self.logger.end_scraping_session()
-            self._show_final_results(stock_data, export_result)
+            self._show_final_results(export_result)
             
             return 0
             
@@ -121,35 +128,44 @@ class StooqScraperApp:
     
     def _apply_cli_overrides(self, args):
         """Apply command line argument overrides to configuration"""
-        # Override scraping parameters
+        # Scraping parameters
+        scraping = {}
         if args.url:
-            self.config_manager.set_config_value('scraping.base_url', args.url)
-        
+            scraping['base_url'] = args.url
         if args.delay:
-            self.config_manager.set_config_value('scraping.delay_between_requests', args.delay)
-        
+            scraping['delay_between_requests'] = args.delay
         if args.retries:
-            self.config_manager.set_config_value('scraping.max_retries', args.retries)
-        
+            scraping['max_retries'] = args.retries
         if args.timeout:
-            self.config_manager.set_config_value('scraping.timeout', args.timeout)
-        
+            scraping['timeout'] = args.timeout
         if args.headless is not None:
-            self.config_manager.set_config_value('scraping.headless', args.headless)
+            scraping['headless'] = args.headless
         
-        # Override export parameters
+        # Export parameters
+        export = {}
         if args.output_dir:
-            self.config_manager.set_config_value('export.output_directory', args.output_dir)
-        
+            export['output_directory'] = args.output_dir
         if args.filename_prefix:
-            self.config_manager.set_config_value('export.filename_prefix', args.filename_prefix)
+            export['filename_prefix'] = args.filename_prefix
+        if args.format:
+            export['format'] = args.format
         
-        # Override logging parameters
+        # Logging parameters
+        logging = {}
         if args.log_level:
-            self.config_manager.set_config_value('logging.log_level', args.log_level.upper())
-        
+            logging['log_level'] = args.log_level.upper()
         if args.log_file:
-            self.config_manager.set_config_value('logging.log_file', args.log_file)
+            logging['log_file'] = args.log_file
+        
+        overrides = {
+            section: values
+            for section, values in (('scraping', scraping), ('export', export), ('logging', logging))
+            if values
+        }
+        
+        # Merge everything at once instead of one set_config_value per option
+        if overrides:
+            self.config_manager.apply_overrides(overrides)
     
     def _initialize_logger(self):
         """Initialize logging system"""
@@ -172,18 +188,30 @@ class StooqScraperApp:
     
     def _initialize_components(self):
         """Initialize scraper and exporter components"""
+        # Imported here so --create-config/--version never load the scraping stack
+        from src.scraper.stooq_scraper import StooqScraper
+        
         try:
             app_config = self.config_manager.get_app_config()
             
             # Initialize scraper
             self.scraper = StooqScraper(
                 base_url=app_config.scraping.base_url,
-                headless=getattr(app_config.scraping, 'headless', True),
-                timeout=app_config.scraping.timeout
+                headless=app_config.scraping.headless,
+                timeout=app_config.scraping.timeout,
+                concurrency_limit=app_config.scraping.concurrency_limit,
+                selenium_workers=app_config.scraping.selenium_workers,
+                max_retries=app_config.scraping.max_retries,
+                delay=app_config.scraping.delay_between_requests
             )
             
-            # Initialize exporter
-            self.exporter = CSVExporter(
+            # Initialize exporter for the configured output format
+            if app_config.export.format == 'parquet':
+                from src.exporters.parquet_exporter import ParquetExporter as exporter_class
+            else:
+                from src.exporters.csv_exporter import CSVExporter as exporter_class
+            
+            self.exporter = exporter_class(
                 output_directory=app_config.export.output_directory,
                 filename_prefix=app_config.export.filename_prefix,
                 include_timestamp=app_config.export.include_timestamp
@@ -196,19 +224,16 @@ class StooqScraperApp:
     
     def _log_startup_info(self, args):
         """Log startup information"""
-        self.logger.info("="*60)
-        self.logger.info("STOOQ S&P 500 SCRAPER STARTED")
-        self.logger.info("="*60)
+        separator = "=" * 60
+        self.logger.info("%s\nSTOOQ S&P 500 SCRAPER STARTED\n%s", separator, separator)
         
         # Log configuration summary
         config_summary = self.config_manager.get_config_summary()
         self.logger.log_configuration(config_summary)
         
         # Log command line arguments
-        self.logger.info("Command line arguments:")
-        for key, value in vars(args).items():
-            if value is not None:
-                self.logger.info(f"  {key}: {value}")
+        self.logger.info("Command line arguments: %s",
+                         {key: value for key, value in vars(args).items() if value is not None})
     
     def _scrape_data(self):
         """Perform the scraping operation"""
@@ -220,17 +245,20 @@ class StooqScraperApp:
                 self.logger.warning("Shutdown requested before scraping")
                 return []
             
-            # Perform scraping
-            stock_data = self.scraper.fetch_data()
+            # Perform scraping, fetching source pages concurrently when enabled
+            if self.config_manager.get_app_config().scraping.use_async:
+                stock_data = asyncio.run(self.scraper.fetch_data_async())
+            else:
+                stock_data = self.scraper.fetch_data()
             
-            self.logger.info(f"Scraping completed", stocks_found=len(stock_data))
+            self.logger.info("Scraping completed", stocks_found=len(stock_data))
             return stock_data
             
         except Exception as e:
             raise ScrapingError(f"Data scraping failed: {e}")
     
     def _export_data(self, stock_data, output_path=None):
-        """Export scraped data to CSV"""
+        """Export scraped data to the configured format"""
         self.logger.info("Starting data export...")
         
         try:
@@ -240,7 +268,7 @@ class StooqScraperApp:
             if export_result.get('export_successful'):
                 self.logger.log_export_result(
                     filepath=export_result.get('filepath', 'unknown'),
-                    stock_count=export_result.get('row_count', 0),
+                    stock_count=export_result.get('rows_exported', 0),
                     file_size=export_result.get('file_size_bytes', 0)
                 )
             else:
@@ -251,24 +279,32 @@ class StooqScraperApp:
         except Exception as e:
             raise ExportError(f"Data export failed: {e}")
     
-    def _show_final_results(self, stock_data, export_result):
+    def _show_final_results(self, export_result):
         """Show final results summary"""
-        print("\n" + "="*60)
-        print("SCRAPING COMPLETED SUCCESSFULLY")
-        print("="*60)
-        print(f"Stocks scraped: {len(stock_data)}")
-        print(f"Export file: {export_result.get('filepath', 'N/A')}")
-        print(f"File size: {export_result.get('file_size_mb', 0):.2f} MB")
-        print(f"Validation: {'PASSED' if export_result.get('validation_passed') else 'FAILED'}")
+        separator = "=" * 60
+        lines = [
+            "",
+            separator,
+            "SCRAPING COMPLETED SUCCESSFULLY",
+            separator,
+            f"Stocks exported: {export_result.get('rows_exported', 0)}",
+            f"Export file: {export_result.get('filepath', 'N/A')}",
+            f"File size: {export_result.get('file_size_mb', 0):.2f} MB",
+            f"Validation: {'PASSED' if export_result.get('validation_passed') else 'FAILED'}",
+        ]
         
         # Show statistics summary
         stats = self.logger.get_stats_summary()
         if stats.get('duration_seconds'):
-            print(f"Total time: {stats['duration_seconds']:.1f} seconds")
+            lines.append(f"Total time: {stats['duration_seconds']:.1f} seconds")
         if stats.get('success_rate'):
-            print(f"Success rate: {stats['success_rate']:.1f}%")
+            lines.append(f"Success rate: {stats['success_rate']:.1f}%")
+        
+        lines.append(separator)
         
-        print("="*60)
+        # Write the whole summary at once so it is not interleaved with log output
+        sys.stdout.write("\n".join(lines) + "\n")
+        sys.stdout.flush()
     
     def _cleanup(self):
         """Clean up resources"""
@@ -278,6 +314,7 @@ class StooqScraperApp:
             
             if self.logger:
                 self.logger.info("Application cleanup completed")
+                self.logger.shutdown()
                 
         except Exception as e:
             print(f"Warning: Cleanup error: {e}")
@@ -320,11 +357,13 @@ Examples:
     
     # Export options
     parser.add_argument('--output', '-o',
-                       help='Output CSV file path (overrides auto-generation)')
+                       help='Output file path (overrides auto-generation)')
     parser.add_argument('--output-dir',
                        help='Output directory (overrides config)')
     parser.add_argument('--filename-prefix',
                        help='Output filename prefix (overrides config)')
+    parser.add_argument('--format', choices=['csv', 'parquet'],
+                       help='Output file format (overrides config; parquet requires pyarrow)')
     
     # Logging options
     parser.add_argument('--log-level', 
@@ -1,21 +1,84 @@
+import asyncio
+import copy
+import functools
 import json
 import os
 from typing import Dict, Any, Optional
 from pathlib import Path
 
-from .settings import DEFAULT_SETTINGS, DEVELOPMENT_OVERRIDES, PRODUCTION_OVERRIDES
+try:
+    import orjson
+except ImportError:  # Optional: faster JSON parsing/serialization for config files
+    orjson = None
+
+from .settings import DEFAULT_SETTINGS, DEVELOPMENT_SETTINGS, PRODUCTION_SETTINGS, SCHEMA
 from ..models.config_models import AppConfig
 from ..utils.errors import ConfigurationError
 
 
+def _json_loads(data: bytes) -> Any:
+    """Parse JSON bytes, using orjson when available"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data.decode('utf-8'))
+
+
+def _json_dumps(obj: Any) -> bytes:
+    """Serialize to indented UTF-8 JSON bytes, using orjson when available"""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+    return json.dumps(obj, indent=2, ensure_ascii=False).encode('utf-8')
+
+
 class ConfigManager:
-    """Configuration manager using built-in json module"""
+    """Configuration manager using JSON files (orjson when installed, else built-in json)"""
+    
+    # Loaded and validated configurations keyed by (abspath, mtime, environment)
+    _CACHE: Dict[tuple, Dict[str, Any]] = {}
+    
+    # Split dot-notation key paths, pre-filled with the paths the CLI overrides
+    _path_cache: Dict[str, tuple] = {
+        key_path: tuple(key_path.split('.')) for key_path in (
+            'scraping.base_url', 'scraping.delay_between_requests', 'scraping.max_retries',
+            'scraping.timeout', 'scraping.headless', 'export.output_directory',
+            'export.filename_prefix', 'export.format', 'logging.log_level', 'logging.log_file',
+        )
+    }
+    
+    # Value checks and their wording for the rules used in SCHEMA
+    _RULES = {
+        'non_empty': (bool, 'non-empty '),
+        'non_negative': (lambda value: value >= 0, 'non-negative '),
+        'positive': (lambda value: value > 0, 'positive '),
+        None: (lambda value: True, ''),
+    }
+    _TYPE_NAMES = {str: 'string', int: 'integer', bool: 'boolean', (int, float): 'number'}
+    
+    # Required sections, and required fields per section derived from SCHEMA
+    _REQUIRED_SECTIONS = ('scraping', 'export', 'logging')
+    _REQUIRED_FIELDS = {
+        section: frozenset(field for field, (_, _, required) in fields.items() if required)
+        for section, fields in SCHEMA.items()
+    }
     
     def __init__(self, config_path: Optional[str] = None, environment: str = "production"):
         self.config_path = config_path or "config.json"
         self.environment = environment.lower()
         self._config_data = None
         self._app_config = None
+        # Result of the last stat of config_path (see refresh_stat)
+        self._config_exists = False
+        self._config_mtime = 0
+    
+    def refresh_stat(self) -> bool:
+        """Re-check whether the config file exists and record its mtime"""
+        try:
+            self._config_mtime = os.stat(self.config_path).st_mtime
+            self._config_exists = True
+        except OSError:
+            self._config_mtime = 0
+            self._config_exists = False
+        return self._config_exists
     
     def load_config(self, config_path: Optional[str] = None) -> Dict[str, Any]:
         """Load configuration from file or use defaults"""
@@ -23,18 +86,22 @@ class ConfigManager:
             self.config_path = config_path
         
         try:
-            # Start with default settings
-            config = self._deep_copy_dict(DEFAULT_SETTINGS)
+            # Reuse a previous load of the same unchanged file and environment
+            config_exists = self.refresh_stat()
+            cache_key = (os.path.abspath(self.config_path), self._config_mtime, self.environment)
+            cached = self._CACHE.get(cache_key)
+            if cached is not None:
+                # Cached entries were validated when stored, and this copy is unmodified
+                self._config_data = copy.deepcopy(cached)
+                return self._config_data
             
-            # Apply environment-specific overrides
-            env_overrides = self._get_environment_overrides()
-            if env_overrides:
-                config = self._merge_configs(config, env_overrides)
+            # Start with a single copy of the pre-merged environment settings
+            config = self._deep_copy_dict(self._get_environment_settings())
             
             # Load from file if exists
-            if os.path.exists(self.config_path):
+            if config_exists:
                 file_config = self._load_from_file(self.config_path)
-                config = self._merge_configs(config, file_config)
+                self._merge_configs(config, file_config)
                 print(f"Configuration loaded from {self.config_path}")
             else:
                 print(f"Configuration file {self.config_path} not found, using defaults")
@@ -42,150 +109,101 @@ class ConfigManager:
             # Validate configuration
             self.validate_config(config)
             
+            self._CACHE[cache_key] = copy.deepcopy(config)
             self._config_data = config
             return config
             
         except Exception as e:
             raise ConfigurationError(f"Failed to load configuration: {e}")
     
+    @classmethod
+    def clear_cache(cls):
+        """Forget all cached configurations (e.g. between tests)"""
+        cls._CACHE.clear()
+    
     def _load_from_file(self, filepath: str) -> Dict[str, Any]:
         """Load configuration from JSON file"""
         try:
-            with open(filepath, 'r', encoding='utf-8') as f:
-                return json.load(f)
+            with open(filepath, 'rb') as f:
+                return _json_loads(f.read())
         except json.JSONDecodeError as e:
             raise ConfigurationError(f"Invalid JSON in config file {filepath}: {e}")
         except Exception as e:
             raise ConfigurationError(f"Failed to read config file {filepath}: {e}")
     
-    def _get_environment_overrides(self) -> Optional[Dict[str, Any]]:
-        """Get environment-specific configuration overrides"""
+    def _get_environment_settings(self) -> Dict[str, Any]:
+        """Get default settings with environment-specific overrides applied"""
         if self.environment == "development":
-            return DEVELOPMENT_OVERRIDES
+            return DEVELOPMENT_SETTINGS
         elif self.environment == "production":
-            return PRODUCTION_OVERRIDES
+            return PRODUCTION_SETTINGS
         else:
-            return None
+            return DEFAULT_SETTINGS
     
     def _deep_copy_dict(self, original: Dict[str, Any]) -> Dict[str, Any]:
-        """Deep copy dictionary using json serialization"""
-        return json.loads(json.dumps(original))
+        """Deep copy a configuration dictionary"""
+        return copy.deepcopy(original)
     
     def _merge_configs(self, base: Dict[str, Any], override: Dict[str, Any]) -> Dict[str, Any]:
-        """Merge two configuration dictionaries recursively"""
-        result = self._deep_copy_dict(base)
+        """Merge override into base recursively, in place, and return base
         
-        for key, value in override.items():
-            if key in result and isinstance(result[key], dict) and isinstance(value, dict):
-                result[key] = self._merge_configs(result[key], value)
-            else:
-                result[key] = value
+        base must be a copy owned by the caller; override is never aliased.
+        """
+        # Walk nested sections with an explicit stack instead of recursing
+        stack = [(base, override)]
+        while stack:
+            base_node, override_node = stack.pop()
+            for key, value in override_node.items():
+                if isinstance(value, dict) and isinstance(base_node.get(key), dict):
+                    stack.append((base_node[key], value))
+                elif isinstance(value, (dict, list)):
+                    base_node[key] = copy.deepcopy(value)
+                else:
+                    base_node[key] = value
         
-        return result
+        return base
     
     def validate_config(self, config: Dict[str, Any]) -> bool:
         """Validate configuration with clear error messages"""
         try:
             # Validate required sections
-            required_sections = ['scraping', 'export', 'logging']
-            for section in required_sections:
-                if section not in config:
-                    raise ConfigurationError(f"Missing required configuration section: {section}")
+            missing = [section for section in self._REQUIRED_SECTIONS if section not in config]
+            if missing:
+                raise ConfigurationError(f"Missing required configuration section: {missing[0]}")
             
-            # Validate scraping configuration
-            scraping = config['scraping']
-            self._validate_scraping_config(scraping)
-            
-            # Validate export configuration
-            export = config['export']
-            self._validate_export_config(export)
-            
-            # Validate logging configuration
-            logging = config['logging']
-            self._validate_logging_config(logging)
+            # Validate each section against the declared schema
+            for section in self._REQUIRED_SECTIONS:
+                self._validate_section(section, config[section], SCHEMA[section])
             
             # Validate validation rules if present
             if 'validation' in config:
-                self._validate_validation_config(config['validation'])
+                self._validate_section('validation', config['validation'], SCHEMA['validation'])
             
             return True
             
         except Exception as e:
             raise ConfigurationError(f"Configuration validation failed: {e}")
     
-    def _validate_scraping_config(self, scraping: Dict[str, Any]):
-        """Validate scraping configuration section"""
-        # Required fields
-        required_fields = ['base_url', 'delay_between_requests', 'max_retries', 'timeout']
-        for field in required_fields:
-            if field not in scraping:
-                raise ConfigurationError(f"Missing required scraping field: {field}")
-        
-        # Validate types and ranges
-        if not isinstance(scraping['base_url'], str) or not scraping['base_url']:
-            raise ConfigurationError("base_url must be a non-empty string")
-        
-        if not isinstance(scraping['delay_between_requests'], (int, float)) or scraping['delay_between_requests'] < 0:
-            raise ConfigurationError("delay_between_requests must be a non-negative number")
-        
-        if not isinstance(scraping['max_retries'], int) or scraping['max_retries'] < 0:
-            raise ConfigurationError("max_retries must be a non-negative integer")
-        
-        if not isinstance(scraping['timeout'], int) or scraping['timeout'] <= 0:
-            raise ConfigurationError("timeout must be a positive integer")
-        
-        # Optional fields validation
-        if 'headless' in scraping and not isinstance(scraping['headless'], bool):
-            raise ConfigurationError("headless must be a boolean")
-        
-        if 'max_pages' in scraping:
-            if not isinstance(scraping['max_pages'], int) or scraping['max_pages'] <= 0:
-                raise ConfigurationError("max_pages must be a positive integer")
-    
-    def _validate_export_config(self, export: Dict[str, Any]):
-        """Validate export configuration section"""
-        # Required fields
-        required_fields = ['output_directory', 'filename_prefix']
-        for field in required_fields:
-            if field not in export:
-                raise ConfigurationError(f"Missing required export field: {field}")
+    def _validate_section(self, section_name: str, section: Dict[str, Any], schema: Dict[str, tuple]):
+        """Validate a configuration section against its schema entry"""
+        missing = self._REQUIRED_FIELDS[section_name] - section.keys()
+        if missing:
+            raise ConfigurationError(f"Missing required {section_name} fields: {sorted(missing)}")
         
-        # Validate types
-        if not isinstance(export['output_directory'], str) or not export['output_directory']:
-            raise ConfigurationError("output_directory must be a non-empty string")
-        
-        if not isinstance(export['filename_prefix'], str) or not export['filename_prefix']:
-            raise ConfigurationError("filename_prefix must be a non-empty string")
-        
-        # Optional fields
-        if 'include_timestamp' in export and not isinstance(export['include_timestamp'], bool):
-            raise ConfigurationError("include_timestamp must be a boolean")
-    
-    def _validate_logging_config(self, logging: Dict[str, Any]):
-        """Validate logging configuration section"""
-        # Validate log level
-        if 'log_level' in logging:
-            valid_levels = ['DEBUG', 'INFO', 'WARNING', 'ERROR', 'CRITICAL']
-            if logging['log_level'] not in valid_levels:
-                raise ConfigurationError(f"log_level must be one of: {valid_levels}")
-        
-        # Optional fields
-        if 'console_output' in logging and not isinstance(logging['console_output'], bool):
-            raise ConfigurationError("console_output must be a boolean")
-    
-    def _validate_validation_config(self, validation: Dict[str, Any]):
-        """Validate validation rules configuration"""
-        # Validate numeric ranges
-        numeric_fields = ['min_price', 'max_price', 'max_percentage_change']
-        for field in numeric_fields:
-            if field in validation:
-                if not isinstance(validation[field], (int, float)) or validation[field] < 0:
-                    raise ConfigurationError(f"{field} must be a non-negative number")
-        
-        # Validate max_symbol_length
-        if 'max_symbol_length' in validation:
-            if not isinstance(validation['max_symbol_length'], int) or validation['max_symbol_length'] <= 0:
-                raise ConfigurationError("max_symbol_length must be a positive integer")
+        for field, (expected_type, rule, _) in schema.items():
+            if field not in section:
+                continue
+            
+            value = section[field]
+            
+            if isinstance(rule, tuple):
+                if value not in rule:
+                    raise ConfigurationError(f"{field} must be one of: {list(rule)}")
+                continue
+            
+            check, wording = self._RULES[rule]
+            if not isinstance(value, expected_type) or not check(value):
+                raise ConfigurationError(f"{field} must be a {wording}{self._TYPE_NAMES[expected_type]}")
     
     def get_app_config(self) -> AppConfig:
         """Get validated AppConfig object"""
@@ -194,30 +212,41 @@ class ConfigManager:
         
         if not self._app_config:
             try:
-                self._app_config = AppConfig(
-                    scraping=self._config_data['scraping'],
-                    export=self._config_data['export'],
-                    logging=self._config_data['logging']
-                )
+                self._app_config = AppConfig.from_dict(self._config_data)
             except Exception as e:
                 raise ConfigurationError(f"Failed to create AppConfig: {e}")
         
         return self._app_config
     
-    def save_config(self, config: Dict[str, Any], filepath: Optional[str] = None) -> str:
-        """Save configuration to JSON file"""
+    def save_config(self, config: Dict[str, Any], filepath: Optional[str] = None,
+                    validated: bool = False, durable: bool = True) -> str:
+        """Save configuration to JSON file atomically (validated skips re-validation, durable=False skips fsync)"""
         save_path = filepath or self.config_path
         
         try:
             # Validate before saving
-            self.validate_config(config)
+            if not validated:
+                self.validate_config(config)
             
             # Ensure directory exists
             Path(save_path).parent.mkdir(parents=True, exist_ok=True)
             
-            # Save to file with pretty formatting
-            with open(save_path, 'w', encoding='utf-8') as f:
-                json.dump(config, f, indent=2, ensure_ascii=False)
+            # Write to a temporary file and swap it in, so a reader never sees a partial file
+            tmp_path = f"{save_path}.tmp.{os.getpid()}"
+            try:
+                with open(tmp_path, 'wb') as f:
+                    f.write(_json_dumps(config))
+                    if durable:
+                        f.flush()
+                        os.fsync(f.fileno())
+                os.replace(tmp_path, save_path)
+            except BaseException:
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+                raise
+            
+            if save_path == self.config_path:
+                self.refresh_stat()
             
             print(f"Configuration saved to {save_path}")
             return save_path
@@ -225,23 +254,40 @@ class ConfigManager:
         except Exception as e:
             raise ConfigurationError(f"Failed to save configuration to {save_path}: {e}")
     
+    async def save_config_async(self, config: Dict[str, Any], filepath: Optional[str] = None,
+                                validated: bool = False, durable: bool = True) -> str:
+        """Save configuration without blocking the running event loop"""
+        # The write runs in the default executor; save_config does the real work
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            None, functools.partial(self.save_config, config, filepath, validated, durable)
+        )
+    
     def create_default_config_file(self, filepath: Optional[str] = None) -> str:
         """Create a default configuration file"""
         save_path = filepath or self.config_path
         
         try:
+            # The built-in defaults are known to be valid
             config = self._deep_copy_dict(DEFAULT_SETTINGS)
-            return self.save_config(config, save_path)
+            return self.save_config(config, save_path, validated=True)
         except Exception as e:
             raise ConfigurationError(f"Failed to create default config file: {e}")
     
+    def _split_path(self, key_path: str) -> tuple:
+        """Split a dot-notation key path, caching the result"""
+        keys = self._path_cache.get(key_path)
+        if keys is None:
+            keys = self._path_cache.setdefault(key_path, tuple(key_path.split('.')))
+        return keys
+    
     def get_config_value(self, key_path: str, default: Any = None) -> Any:
         """Get configuration value using dot notation (e.g., 'scraping.timeout')"""
         if not self._config_data:
             self.load_config()
         
         try:
-            keys = key_path.split('.')
+            keys = self._split_path(key_path)
             value = self._config_data
             
             for key in keys:
@@ -261,7 +307,7 @@ class ConfigManager:
             self.load_config()
         
         try:
-            keys = key_path.split('.')
+            keys = self._split_path(key_path)
             config = self._config_data
             
             # Navigate to the parent of the target key
@@ -279,6 +325,20 @@ class ConfigManager:
         except Exception as e:
             raise ConfigurationError(f"Failed to set config value {key_path}: {e}")
     
+    def apply_overrides(self, overrides: Dict[str, Any]):
+        """Merge a nested dictionary of overrides into the configuration in one pass"""
+        if not self._config_data:
+            self.load_config()
+        
+        try:
+            self._merge_configs(self._config_data, overrides)
+            
+            # Invalidate cached app config once
+            self._app_config = None
+            
+        except Exception as e:
+            raise ConfigurationError(f"Failed to apply config overrides: {e}")
+    
     def get_config_summary(self) -> Dict[str, Any]:
         """Get summary of current configuration"""
         if not self._config_data:
@@ -286,7 +346,7 @@ class ConfigManager:
         
         return {
             'config_file': self.config_path,
-            'config_exists': os.path.exists(self.config_path),
+            'config_exists': self._config_exists,
             'environment': self.environment,
             'sections': list(self._config_data.keys()),
             'scraping_url': self._config_data.get('scraping', {}).get('base_url'),
@@ -1,5 +1,7 @@
 """Default configuration settings for the Stooq S&P 500 scraper"""
 
+import copy
+
 DEFAULT_SETTINGS = {
     "scraping": {
         "base_url": "https://stooq.com/q/i/?s=^spx",
@@ -10,13 +12,17 @@ DEFAULT_SETTINGS = {
         "headless": True,
         "use_selenium_fallback": True,
         "max_pages": 15,
-        "min_stocks_threshold": 100
+        "min_stocks_threshold": 100,
+        "use_async": True,
+        "concurrency_limit": 8,
+        "selenium_workers": 1
     },
     "export": {
         "output_directory": "./data",
         "filename_prefix": "sp500_data",
         "include_timestamp": True,
-        "validate_output": True
+        "validate_output": True,
+        "format": "csv"
     },
     "logging": {
         "log_level": "INFO",
@@ -55,4 +61,52 @@ PRODUCTION_OVERRIDES = {
         "log_level": "WARNING",
         "console_output": False
     }
-}
\ No newline at end of file
+}
+
+# Validation schema: section -> field -> (accepted types, rule, required)
+# Rules: "non_empty", "non_negative", "positive", None (type only) or a tuple of allowed values
+SCHEMA = {
+    "scraping": {
+        "base_url": (str, "non_empty", True),
+        "delay_between_requests": ((int, float), "non_negative", True),
+        "max_retries": (int, "non_negative", True),
+        "timeout": (int, "positive", True),
+        "headless": (bool, None, False),
+        "max_pages": (int, "positive", False),
+        "use_async": (bool, None, False),
+        "concurrency_limit": (int, "positive", False),
+        "selenium_workers": (int, "positive", False)
+    },
+    "export": {
+        "output_directory": (str, "non_empty", True),
+        "filename_prefix": (str, "non_empty", True),
+        "include_timestamp": (bool, None, False),
+        "format": (str, ("csv", "parquet"), False)
+    },
+    "logging": {
+        "log_level": (str, ("DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL"), False),
+        "console_output": (bool, None, False)
+    },
+    "validation": {
+        "min_price": ((int, float), "non_negative", False),
+        "max_price": ((int, float), "non_negative", False),
+        "max_percentage_change": ((int, float), "non_negative", False),
+        "max_symbol_length": (int, "positive", False)
+    }
+}
+
+
+def _merge(base, override):
+    """Return a new dict with override recursively merged over base"""
+    merged = copy.deepcopy(base)
+    for key, value in override.items():
+        if isinstance(value, dict) and isinstance(merged.get(key), dict):
+            merged[key] = _merge(merged[key], value)
+        else:
+            merged[key] = copy.deepcopy(value)
+    return merged
+
+
+# Full settings per environment, merged once at import time
+DEVELOPMENT_SETTINGS = _merge(DEFAULT_SETTINGS, DEVELOPMENT_OVERRIDES)
+PRODUCTION_SETTINGS = _merge(DEFAULT_SETTINGS, PRODUCTION_OVERRIDES)
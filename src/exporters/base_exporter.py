@@ -1,12 +1,138 @@
+import os
+import re
 from abc import ABC, abstractmethod
-from typing import List
+from datetime import datetime
+from pathlib import Path
+from typing import Iterable, Iterator, List, Set
+
 from ..models.stock_data import StockData
+from ..models.stock_frame import StockFrame
+from ..utils.errors import ExportError
+
+
+# Valid symbols: up to 10 letters, digits and dots, with at least one letter or digit
+_SYMBOL_RE = re.compile(r'(?=[A-Z0-9.]{1,10}\Z)\.*[A-Z0-9]')
 
 
 class BaseExporter(ABC):
-    """Base interface for all data exporters"""
+    """Base interface for all data exporters, with the row validation every format shares"""
+    
+    # Extension of generated export filenames
+    FILE_EXTENSION = ''
+    
+    # Stocks gathered into each column-oriented frame while exporting
+    FRAME_ROWS = 1000
+    
+    # Output directories already created by any exporter in this process
+    _dirs_created: Set[str] = set()
     
     @abstractmethod
-    def export(self, data: List[StockData], path: str) -> None:
-        """Export stock data to specified path"""
-        pass
\ No newline at end of file
+    def export(self, data: Iterable[StockData], path: str) -> int:
+        """Export stock data to specified path and return the number of rows written"""
+        pass
+    
+    def _ensure_directory_exists(self):
+        """Create output directory if it doesn't exist"""
+        directory = os.path.abspath(self.output_directory)
+        if directory in self._dirs_created:
+            return
+        
+        try:
+            Path(directory).mkdir(parents=True, exist_ok=True)
+            self._dirs_created.add(directory)
+        except Exception as e:
+            raise ExportError(f"Failed to create output directory {self.output_directory}: {e}")
+    
+    def _recreate_directory(self, path: str) -> bool:
+        """Re-create path's directory if this process created it and it was removed since"""
+        directory = os.path.dirname(os.path.abspath(path))
+        if directory not in self._dirs_created or os.path.isdir(directory):
+            return False
+        
+        self._dirs_created.discard(directory)
+        try:
+            Path(directory).mkdir(parents=True, exist_ok=True)
+        except OSError:
+            return False
+        self._dirs_created.add(directory)
+        return True
+    
+    def _generate_filename(self) -> str:
+        """Generate filename with timestamp"""
+        timestamp_str = ""
+        if self.include_timestamp:
+            timestamp = datetime.now()
+            timestamp_str = f"_{timestamp.strftime('%Y%m%d_%H%M%S')}"
+        
+        filename = f"{self.filename_prefix}{timestamp_str}{self.FILE_EXTENSION}"
+        return os.path.join(self.output_directory, filename)
+    
+    def _validate_into_frames(self, data: Iterable[StockData], warnings: List[str]) -> Iterator[StockFrame]:
+        """Validate and clean data, yielding frames of up to FRAME_ROWS valid stocks and appending warnings"""
+        # One fallback timestamp shared by every stock that lacks its own
+        default_timestamp = datetime.now()
+        frame = StockFrame()
+        
+        for i, stock in enumerate(data):
+            try:
+                # Basic validation
+                symbol = stock.symbol
+                if not symbol:
+                    warnings.append(f"Skipping stock at index {i} - no symbol")
+                    continue
+                
+                # Clean symbol (remove extra whitespace, convert to uppercase)
+                symbol = stock.symbol = symbol.strip().upper()
+                
+                # Validate symbol format
+                if not _SYMBOL_RE.match(symbol):
+                    warnings.append(f"Skipping invalid symbol: {symbol}")
+                    continue
+                
+                # Clean company name
+                company_name = stock.company_name
+                if company_name:
+                    company_name = stock.company_name = company_name.strip()
+                
+                # Validate price range
+                price = stock.price
+                if price is not None:
+                    if price < 0 or price > 100000:
+                        warnings.append(f"Invalid price for {symbol}: {price}")
+                        price = stock.price = None
+                
+                # Validate percentage range
+                change_percent = stock.change_percent
+                if change_percent is not None:
+                    if abs(change_percent) > 1000:  # Allow for extreme cases
+                        warnings.append(f"Extreme percentage change for {symbol}: {change_percent}%")
+                
+                # Ensure timestamp exists
+                timestamp = stock.timestamp
+                if not timestamp:
+                    timestamp = stock.timestamp = default_timestamp
+                
+                # Ensure status is set
+                status = stock.status
+                if not status:
+                    status = stock.status = 'success' if price is not None else 'partial'
+                
+            except Exception as e:
+                warnings.append(f"Error validating stock at index {i}: {e}")
+                continue
+            
+            # Fill the frame from the values just checked instead of re-reading the stock
+            frame.symbols.append(symbol)
+            frame.company_names.append(company_name)
+            frame.prices.append(price)
+            frame.change_percents.append(change_percent)
+            frame.change_absolutes.append(stock.change_absolute)
+            frame.timestamps.append(timestamp)
+            frame.statuses.append(status)
+            
+            if len(frame) >= self.FRAME_ROWS:
+                yield frame
+                frame = StockFrame()
+        
+        if frame:
+            yield frame
\ No newline at end of file
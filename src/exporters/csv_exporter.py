@@ -1,17 +1,88 @@
 import csv
+import mmap
 import os
 from datetime import datetime
-from typing import List, Optional
-from pathlib import Path
+from typing import Iterable, List, Optional, Tuple
 
 from .base_exporter import BaseExporter
 from ..models.stock_data import StockData
+from ..models.stock_frame import StockFrame
 from ..utils.errors import ExportError
+from ..utils.logger import get_logger
+
+
+_logger = get_logger('csv_exporter')
+
+
+# CSV column headers and the encoded header line written at the top of each export
+_HEADERS = ('symbol', 'company_name', 'price', 'change_percent', 'change_absolute', 'timestamp', 'status')
+_HEADER_LINE = (','.join(_HEADERS) + '\r\n').encode('utf-8')
+
+# Raw file flags for export files (O_BINARY only exists, and matters, on Windows)
+_OPEN_FLAGS = os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, 'O_BINARY', 0)
+
+
+def _write_all(fd: int, data: bytes):
+    """Write all of data to a raw file descriptor, looping over partial writes"""
+    view = memoryview(data)
+    while view:
+        written = os.write(fd, view)
+        view = view[written:]
+
+
+def _csv_field(value: str) -> str:
+    """Quote a text field the way csv.QUOTE_MINIMAL would"""
+    if ',' in value or '"' in value or '\n' in value or '\r' in value:
+        return '"' + value.replace('"', '""') + '"'
+    return value
+
+
+def _count_unquoted_newlines(data: bytes) -> int:
+    """Count record-ending newlines, skipping those inside quoted fields
+    
+    Splitting on quotes leaves the unquoted text at even positions; an escaped "" opens
+    and closes an empty piece, so it does not shift the parity.
+    """
+    return sum(piece.count(b'\n') for piece in data.split(b'"')[::2])
+
+
+def _format_number(template: str, value) -> str:
+    """Format one value with template, writing N/A for missing or non-numeric values"""
+    if value is None:
+        return 'N/A'
+    
+    try:
+        return template % value
+    except (ValueError, TypeError):
+        return 'N/A'
+
+
+def _format_number_column(template: str, values: List[Optional[float]]) -> List[str]:
+    """Format a whole column in one pass, going value by value only if a value is not numeric"""
+    try:
+        return ['N/A' if value is None else template % value for value in values]
+    except (ValueError, TypeError):
+        return [_format_number(template, value) for value in values]
+
+
+def _format_price_column(values: List[Optional[float]]) -> List[str]:
+    """Format a price column to 2 decimal places"""
+    return _format_number_column('%.2f', values)
+
+
+def _format_percentage_column(values: List[Optional[float]]) -> List[str]:
+    """Format a percentage column to 2 decimal places with a % sign"""
+    return _format_number_column('%.2f%%', values)
 
 
 class CSVExporter(BaseExporter):
     """CSV exporter using built-in csv module with minimal dependencies"""
     
+    FILE_EXTENSION = '.csv'
+    
+    # Bytes staged before each write to the export file (1 MB)
+    WRITE_BUFFER_SIZE = 1 << 20
+    
     def __init__(self, output_directory: str = "./data", 
                  filename_prefix: str = "sp500_data",
                  include_timestamp: bool = True):
@@ -22,178 +93,100 @@ class CSVExporter(BaseExporter):
         # Ensure output directory exists
         self._ensure_directory_exists()
     
-    def _ensure_directory_exists(self):
-        """Create output directory if it doesn't exist"""
-        try:
-            Path(self.output_directory).mkdir(parents=True, exist_ok=True)
-        except Exception as e:
-            raise ExportError(f"Failed to create output directory {self.output_directory}: {e}")
-    
-    def export(self, data: List[StockData], path: str = None) -> str:
-        """Export stock data to CSV file"""
-        if not data:
-            raise ExportError("No data provided for export")
-        
+    def export(self, data: Iterable[StockData], path: str = None) -> int:
+        """Export stock data (any iterable, e.g. a generator) to CSV and return the row count"""
         # Generate filename if not provided
         if path is None:
             path = self._generate_filename()
         
-        # Validate data before export
-        valid_data = self._validate_and_clean_data(data)
-        if not valid_data:
-            raise ExportError("No valid data to export after validation")
+        # Validation fills the column frames that are written, so the data is walked only once;
+        # warnings are collected and logged together after the write
+        warnings = []
         
         try:
-            # Write CSV file
-            with open(path, 'w', newline='', encoding='utf-8') as csvfile:
-                writer = csv.DictWriter(csvfile, fieldnames=self._get_csv_headers())
-                
-                # Write headers
-                writer.writeheader()
-                
-                # Write data rows
-                for stock in valid_data:
-                    writer.writerow(self._stock_to_csv_row(stock))
+            # Write CSV file: collect encoded frames and hand them to the file in large blocks.
+            # b''.join sizes its result once, so no buffer is grown and re-copied row by row
+            chunks = [_HEADER_LINE]
+            pending = len(_HEADER_LINE)
+            row_count = 0
             
-            print(f"Successfully exported {len(valid_data)} stocks to {path}")
-            return path
+            try:
+                fd = os.open(path, _OPEN_FLAGS, 0o644)
+            except FileNotFoundError:
+                # The output directory was deleted after it was first created
+                if not self._recreate_directory(path):
+                    raise
+                fd = os.open(path, _OPEN_FLAGS, 0o644)
+            try:
+                # Format column by column, one frame of FRAME_ROWS stocks at a time
+                for frame in self._validate_into_frames(data, warnings):
+                    chunk = self._frame_to_csv(frame).encode('utf-8')
+                    chunks.append(chunk)
+                    pending += len(chunk)
+                    row_count += len(frame)
+                    if pending >= self.WRITE_BUFFER_SIZE:
+                        _write_all(fd, b''.join(chunks))
+                        chunks.clear()
+                        pending = 0
+                
+                if chunks:
+                    _write_all(fd, b''.join(chunks))
+            finally:
+                # Deliberately no os.fsync: the file is re-read right away from the page cache,
+                # and a crash mid-export just means re-running the scrape
+                os.close(fd)
             
         except Exception as e:
             raise ExportError(f"Failed to write CSV file {path}: {e}")
-    
-    def _generate_filename(self) -> str:
-        """Generate filename with timestamp"""
-        timestamp_str = ""
-        if self.include_timestamp:
-            timestamp = datetime.now()
-            timestamp_str = f"_{timestamp.strftime('%Y%m%d_%H%M%S')}"
         
-        filename = f"{self.filename_prefix}{timestamp_str}.csv"
-        return os.path.join(self.output_directory, filename)
-    
-    def _get_csv_headers(self) -> List[str]:
-        """Get CSV column headers"""
-        return [
-            'symbol',
-            'company_name',
-            'price',
-            'change_percent',
-            'change_absolute',
-            'timestamp',
-            'status'
-        ]
-    
-    def _stock_to_csv_row(self, stock: StockData) -> dict:
-        """Convert StockData to CSV row dictionary"""
-        return {
-            'symbol': stock.symbol or 'N/A',
-            'company_name': stock.company_name or 'N/A',
-            'price': self._format_price(stock.price),
-            'change_percent': self._format_percentage(stock.change_percent),
-            'change_absolute': self._format_price(stock.change_absolute),
-            'timestamp': stock.timestamp.isoformat() if stock.timestamp else 'N/A',
-            'status': stock.status or 'unknown'
-        }
-    
-    def _format_price(self, price: Optional[float]) -> str:
-        """Format price for CSV output"""
-        if price is None:
-            return 'N/A'
+        if warnings:
+            _logger.warning("%d export validation warnings:\n  %s", len(warnings), "\n  ".join(warnings))
         
-        try:
-            # Format to 2 decimal places
-            return f"{price:.2f}"
-        except (ValueError, TypeError):
-            return 'N/A'
-    
-    def _format_percentage(self, percentage: Optional[float]) -> str:
-        """Format percentage for CSV output"""
-        if percentage is None:
-            return 'N/A'
+        if row_count == 0:
+            # Don't leave a header-only file behind
+            os.remove(path)
+            raise ExportError("No valid data to export after validation")
         
-        try:
-            # Format to 2 decimal places with % sign
-            return f"{percentage:.2f}%"
-        except (ValueError, TypeError):
-            return 'N/A'
+        print(f"Successfully exported {row_count} stocks to {path}")
+        return row_count
     
-    def _validate_and_clean_data(self, data: List[StockData]) -> List[StockData]:
-        """Validate and clean data before export"""
-        valid_data = []
-        
-        for i, stock in enumerate(data):
-            try:
-                # Basic validation
-                if not stock.symbol:
-                    print(f"Warning: Skipping stock at index {i} - no symbol")
-                    continue
-                
-                # Clean symbol (remove extra whitespace, convert to uppercase)
-                stock.symbol = stock.symbol.strip().upper()
-                
-                # Validate symbol format
-                if len(stock.symbol) > 10 or not stock.symbol.replace('.', '').isalnum():
-                    print(f"Warning: Skipping invalid symbol: {stock.symbol}")
-                    continue
-                
-                # Clean company name
-                if stock.company_name:
-                    stock.company_name = stock.company_name.strip()
-                
-                # Validate price range
-                if stock.price is not None:
-                    if stock.price < 0 or stock.price > 100000:
-                        print(f"Warning: Invalid price for {stock.symbol}: {stock.price}")
-                        stock.price = None
-                
-                # Validate percentage range
-                if stock.change_percent is not None:
-                    if abs(stock.change_percent) > 1000:  # Allow for extreme cases
-                        print(f"Warning: Extreme percentage change for {stock.symbol}: {stock.change_percent}%")
-                
-                # Ensure timestamp exists
-                if not stock.timestamp:
-                    stock.timestamp = datetime.now()
-                
-                # Ensure status is set
-                if not stock.status:
-                    stock.status = 'success' if stock.price is not None else 'partial'
-                
-                valid_data.append(stock)
-                
-            except Exception as e:
-                print(f"Warning: Error validating stock at index {i}: {e}")
-                continue
-        
-        return valid_data
+    def _get_csv_headers(self) -> Tuple[str, ...]:
+        """Get CSV column headers"""
+        return _HEADERS
+    
+    def _frame_to_csv(self, frame: StockFrame) -> str:
+        """Format a StockFrame as CSV lines in header order, one column at a time"""
+        columns = (
+            [_csv_field(symbol or 'N/A') for symbol in frame.symbols],
+            [_csv_field(name or 'N/A') for name in frame.company_names],
+            _format_price_column(frame.prices),
+            _format_percentage_column(frame.change_percents),
+            _format_price_column(frame.change_absolutes),
+            [ts.isoformat() if ts else 'N/A' for ts in frame.timestamps],
+            [_csv_field(status or 'unknown') for status in frame.statuses],
+        )
+        return ''.join(','.join(row) + '\r\n' for row in zip(*columns))
     
     def validate_csv_output(self, filepath: str) -> bool:
         """Validate that CSV file was created correctly"""
         try:
-            if not os.path.exists(filepath):
-                return False
-            
-            # Check file size
-            if os.path.getsize(filepath) == 0:
+            # Check the file exists and is not empty with a single stat call
+            try:
+                if os.stat(filepath).st_size == 0:
+                    return False
+            except FileNotFoundError:
                 return False
             
-            # Try to read the CSV file
-            with open(filepath, 'r', encoding='utf-8') as csvfile:
-                reader = csv.DictReader(csvfile)
+            # Try to read the CSV file; only the header and the first data row are parsed
+            with open(filepath, 'r', newline='', encoding='utf-8') as csvfile:
+                reader = csv.reader(csvfile)
                 
-                # Check headers
-                expected_headers = set(self._get_csv_headers())
-                actual_headers = set(reader.fieldnames or [])
-                
-                if not expected_headers.issubset(actual_headers):
+                # Check headers (the exporter always writes them first, in this order)
+                if tuple(next(reader, ()))[:len(_HEADERS)] != _HEADERS:
                     return False
                 
-                # Check if we have at least one data row
-                try:
-                    next(reader)
-                    return True
-                except StopIteration:
-                    return False
+                # Check if we have at least one data row (blank lines don't count)
+                return any(row for row in reader)
                     
         except Exception as e:
             print(f"CSV validation error: {e}")
@@ -202,39 +195,54 @@ class CSVExporter(BaseExporter):
     def get_export_summary(self, filepath: str) -> dict:
         """Get summary information about exported CSV file"""
         try:
-            if not os.path.exists(filepath):
+            # One stat call for existence, size and creation time
+            try:
+                stat = os.stat(filepath)
+            except FileNotFoundError:
                 return {'error': 'File does not exist'}
             
-            file_size = os.path.getsize(filepath)
+            file_size = stat.st_size
             
-            # Count rows
+            # Count records by scanning the mapped bytes for line ends (minus the header line)
             row_count = 0
-            with open(filepath, 'r', encoding='utf-8') as csvfile:
-                reader = csv.DictReader(csvfile)
-                row_count = sum(1 for row in reader)
+            if file_size:
+                with open(filepath, 'rb') as csvfile, \
+                        mmap.mmap(csvfile.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                    if mapped.find(b'"') == -1:
+                        line_count = sum(
+                            mapped[offset:offset + self.WRITE_BUFFER_SIZE].count(b'\n')
+                            for offset in range(0, file_size, self.WRITE_BUFFER_SIZE)
+                        )
+                    else:
+                        line_count = _count_unquoted_newlines(mapped[:])
+                row_count = max(line_count - 1, 0)
             
             return {
                 'filepath': filepath,
                 'file_size_bytes': file_size,
                 'file_size_mb': round(file_size / (1024 * 1024), 2),
                 'row_count': row_count,
-                'created_at': datetime.fromtimestamp(os.path.getctime(filepath)).isoformat()
+                'created_at': datetime.fromtimestamp(stat.st_ctime).isoformat()
             }
             
         except Exception as e:
             return {'error': str(e)}
     
-    def export_with_summary(self, data: List[StockData], path: str = None) -> dict:
+    def export_with_summary(self, data: Iterable[StockData], path: str = None) -> dict:
         """Export data and return summary information"""
         try:
+            if path is None:
+                path = self._generate_filename()
+            
             # Export the data
-            exported_path = self.export(data, path)
+            rows_exported = self.export(data, path)
             
             # Validate the export
-            is_valid = self.validate_csv_output(exported_path)
+            is_valid = self.validate_csv_output(path)
             
             # Get summary
-            summary = self.get_export_summary(exported_path)
+            summary = self.get_export_summary(path)
+            summary['rows_exported'] = rows_exported
             summary['validation_passed'] = is_valid
             summary['export_successful'] = True
             
@@ -0,0 +1,136 @@
+import os
+from datetime import datetime
+from typing import Iterable, List
+
+from .base_exporter import BaseExporter
+from ..models.stock_data import StockData
+from ..utils.errors import ExportError
+from ..utils.logger import get_logger
+
+
+_logger = get_logger('parquet_exporter')
+
+
+class ParquetExporter(BaseExporter):
+    """Parquet exporter backed by pyarrow (optional dependency)"""
+    
+    FILE_EXTENSION = '.parquet'
+    
+    def __init__(self, output_directory: str = "./data",
+                 filename_prefix: str = "sp500_data",
+                 include_timestamp: bool = True,
+                 compression: str = "snappy"):
+        self.output_directory = output_directory
+        self.filename_prefix = filename_prefix
+        self.include_timestamp = include_timestamp
+        self.compression = compression
+        
+        # Fail early if pyarrow is missing rather than after scraping
+        self._pa, self._pq = self._import_pyarrow()
+        
+        # Ensure output directory exists
+        self._ensure_directory_exists()
+    
+    @staticmethod
+    def _import_pyarrow():
+        """Import pyarrow lazily so CSV-only installs never need it"""
+        try:
+            import pyarrow
+            import pyarrow.parquet
+        except ImportError:
+            raise ExportError("Parquet export requires pyarrow: pip install pyarrow")
+        return pyarrow, pyarrow.parquet
+    
+    def _build_table(self, data: Iterable[StockData], warnings: List[str]):
+        """Build a pyarrow Table from the stocks that pass export validation, one batch per frame"""
+        pa = self._pa
+        schema = pa.schema([
+            ('symbol', pa.string()),
+            ('company_name', pa.string()),
+            ('price', pa.float64()),
+            ('change_percent', pa.float64()),
+            ('change_absolute', pa.float64()),
+            ('timestamp', pa.timestamp('us')),
+            ('status', pa.string()),
+        ])
+        
+        batches = [
+            pa.record_batch([
+                frame.symbols, frame.company_names, frame.prices, frame.change_percents,
+                frame.change_absolutes, frame.timestamps, frame.statuses,
+            ], schema=schema)
+            for frame in self._validate_into_frames(data, warnings)
+        ]
+        return pa.Table.from_batches(batches, schema=schema)
+    
+    def export(self, data: Iterable[StockData], path: str = None) -> int:
+        """Export stock data to a Parquet file and return the row count"""
+        if path is None:
+            path = self._generate_filename()
+        
+        # Same row validation as the CSV export, so both formats hold the same rows
+        warnings = []
+        try:
+            table = self._build_table(data, warnings)
+        except Exception as e:
+            raise ExportError(f"Failed to build Parquet table: {e}")
+        
+        if warnings:
+            _logger.warning("%d export validation warnings:\n  %s", len(warnings), "\n  ".join(warnings))
+        
+        if table.num_rows == 0:
+            raise ExportError("No valid data to export after validation")
+        
+        try:
+            self._write_table(table, path)
+        except Exception as e:
+            raise ExportError(f"Failed to write Parquet file {path}: {e}")
+        
+        print(f"Successfully exported {table.num_rows} stocks to {path}")
+        return table.num_rows
+    
+    def _write_table(self, table, path: str):
+        """Write the table, re-creating the output directory once if it was deleted"""
+        try:
+            self._pq.write_table(table, path, compression=self.compression)
+        except FileNotFoundError:
+            if not self._recreate_directory(path):
+                raise
+            self._pq.write_table(table, path, compression=self.compression)
+    
+    def get_export_summary(self, filepath: str) -> dict:
+        """Get summary information about exported Parquet file"""
+        try:
+            stat = os.stat(filepath)
+            return {
+                'filepath': filepath,
+                'file_size_bytes': stat.st_size,
+                'file_size_mb': round(stat.st_size / (1024 * 1024), 2),
+                'row_count': self._pq.read_metadata(filepath).num_rows,
+                'created_at': datetime.fromtimestamp(stat.st_ctime).isoformat()
+            }
+        except Exception as e:
+            return {'error': str(e)}
+    
+    def export_with_summary(self, data: Iterable[StockData], path: str = None) -> dict:
+        """Export data and return summary information"""
+        try:
+            if path is None:
+                path = self._generate_filename()
+            
+            rows_exported = self.export(data, path)
+            
+            # The footer row count must match what was written
+            summary = self.get_export_summary(path)
+            summary['rows_exported'] = rows_exported
+            summary['validation_passed'] = summary.get('row_count') == rows_exported
+            summary['export_successful'] = True
+            
+            return summary
+            
+        except Exception as e:
+            return {
+                'export_successful': False,
+                'error': str(e)
+            }
+
@@ -1,8 +1,10 @@
 from dataclasses import dataclass
 from typing import Optional
 
+from .stock_data import DATACLASS_SLOTS
 
-@dataclass
+
+@dataclass(frozen=True, **DATACLASS_SLOTS)
 class ScrapingParams:
     """Configuration parameters for scraping"""
     base_url: str = "https://stooq.com/q/i/?s=^spx"
@@ -14,6 +16,9 @@ class ScrapingParams:
     use_selenium_fallback: bool = True
     max_pages: int = 15
     min_stocks_threshold: int = 100
+    use_async: bool = True
+    concurrency_limit: int = 8
+    selenium_workers: int = 1
     
     def __post_init__(self):
         """Validate scraping parameters"""
@@ -48,16 +53,26 @@ class ScrapingParams:
         if not isinstance(self.min_stocks_threshold, int) or self.min_stocks_threshold < 0:
             raise ValueError("Min stocks threshold must be a non-negative integer")
         
+        if not isinstance(self.use_async, bool):
+            raise ValueError("Use async must be a boolean")
+        
+        if not isinstance(self.concurrency_limit, int) or self.concurrency_limit <= 0:
+            raise ValueError("Concurrency limit must be a positive integer")
+        
+        if not isinstance(self.selenium_workers, int) or self.selenium_workers <= 0:
+            raise ValueError("Selenium workers must be a positive integer")
+        
         return True
 
 
-@dataclass
+@dataclass(frozen=True, **DATACLASS_SLOTS)
 class ExportParams:
     """Configuration parameters for data export"""
     output_directory: str = "./data"
     filename_prefix: str = "sp500_data"
     include_timestamp: bool = True
     validate_output: bool = True
+    format: str = "csv"
     
     def __post_init__(self):
         """Validate export parameters"""
@@ -77,10 +92,13 @@ class ExportParams:
         if not isinstance(self.validate_output, bool):
             raise ValueError("Validate output must be a boolean")
         
+        if self.format not in ("csv", "parquet"):
+            raise ValueError("Export format must be 'csv' or 'parquet'")
+        
         return True
 
 
-@dataclass
+@dataclass(frozen=True, **DATACLASS_SLOTS)
 class LoggingParams:
     """Configuration parameters for logging"""
     log_level: str = "INFO"
@@ -110,18 +128,21 @@ class LoggingParams:
         return True
 
 
-@dataclass
+@dataclass(frozen=True, **DATACLASS_SLOTS)
 class AppConfig:
     """Main application configuration"""
     scraping: ScrapingParams
     export: ExportParams
     logging: LoggingParams
     
-    def __init__(self, scraping: dict = None, export: dict = None, logging: dict = None):
-        """Initialize configuration with dictionaries"""
-        self.scraping = ScrapingParams(**(scraping or {}))
-        self.export = ExportParams(**(export or {}))
-        self.logging = LoggingParams(**(logging or {}))
+    @classmethod
+    def from_dict(cls, config: dict) -> "AppConfig":
+        """Build configuration from a config dictionary"""
+        return cls(
+            scraping=ScrapingParams(**(config.get('scraping') or {})),
+            export=ExportParams(**(config.get('export') or {})),
+            logging=LoggingParams(**(config.get('logging') or {}))
+        )
     
     def validate(self) -> bool:
         """Validate entire configuration"""
@@ -1,9 +1,13 @@
+import sys
 from dataclasses import dataclass
 from datetime import datetime
 from typing import Optional
 
+# Keyword arguments giving model dataclasses __slots__ (slots=True needs Python 3.10+)
+DATACLASS_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
 
-@dataclass
+
+@dataclass(**DATACLASS_SLOTS)
 class StockData:
     """Data model for stock information"""
     symbol: str
@@ -18,6 +22,21 @@ class StockData:
         """Validate data after initialization"""
         self.validate()
     
+    @classmethod
+    def unchecked(cls, symbol: str, company_name: Optional[str], price: Optional[float],
+                  change_percent: Optional[float], change_absolute: Optional[float],
+                  timestamp: datetime, status: str = "success") -> "StockData":
+        """Create stock data without running validate() (caller guarantees valid values)"""
+        stock = object.__new__(cls)
+        stock.symbol = symbol
+        stock.company_name = company_name
+        stock.price = price
+        stock.change_percent = change_percent
+        stock.change_absolute = change_absolute
+        stock.timestamp = timestamp
+        stock.status = status
+        return stock
+    
     def validate(self) -> bool:
         """Validate stock data using built-in Python functions"""
         if not self.symbol or not isinstance(self.symbol, str):
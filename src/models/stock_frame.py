@@ -0,0 +1,38 @@
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Iterable, List, Optional
+
+from .stock_data import DATACLASS_SLOTS, StockData
+
+
+@dataclass(**DATACLASS_SLOTS)
+class StockFrame:
+    """Column-oriented (struct-of-arrays) view of many StockData rows for bulk export"""
+    symbols: List[str] = field(default_factory=list)
+    company_names: List[Optional[str]] = field(default_factory=list)
+    prices: List[Optional[float]] = field(default_factory=list)
+    change_percents: List[Optional[float]] = field(default_factory=list)
+    change_absolutes: List[Optional[float]] = field(default_factory=list)
+    timestamps: List[datetime] = field(default_factory=list)
+    statuses: List[str] = field(default_factory=list)
+    
+    @classmethod
+    def from_stock_list(cls, stocks: Iterable[StockData]) -> "StockFrame":
+        """Build a frame from StockData objects (any iterable)"""
+        frame = cls()
+        for stock in stocks:
+            frame.append(stock)
+        return frame
+    
+    def append(self, stock: StockData):
+        """Append one StockData row to every column"""
+        self.symbols.append(stock.symbol)
+        self.company_names.append(stock.company_name)
+        self.prices.append(stock.price)
+        self.change_percents.append(stock.change_percent)
+        self.change_absolutes.append(stock.change_absolute)
+        self.timestamps.append(stock.timestamp)
+        self.statuses.append(stock.status)
+    
+    def __len__(self) -> int:
+        return len(self.symbols)
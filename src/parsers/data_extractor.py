@@ -4,6 +4,50 @@ from typing import Optional, List, Dict, Any
 from bs4 import Tag
 from ..models.stock_data import StockData
 from ..utils.errors import DataExtractionError
+from ..utils.logger import get_logger
+from .html_parser import find_row_cells
+
+try:
+    import re2 as _cell_re
+except ImportError:  # Optional: linear-time DFA matching for the per-cell classifier
+    _cell_re = re
+
+
+# Cleaning patterns used for every cell, compiled once
+_HTML_ENTITY_RE = re.compile(r'&nbsp;|&amp;|&lt;|&gt;')
+_CURRENCY_RE = re.compile(r'[$€£¥₹,\s]')
+_PRICE_STRIP_TABLE = str.maketrans('', '', '$€£¥₹ \t\n\r\f\v')
+
+# Cell classifier: 'symbol' for the symbol_patterns, 'number' for text starting like
+# the percentage_patterns (optional sign, then a digit); matched against upper-cased text
+_CELL_KIND_RE = _cell_re.compile(r'(?P<symbol>(?:[A-Z]{1,5}|[A-Z]+\.[A-Z]+)$)|(?P<number>[+-]?\d)')
+
+
+class _PrintableAsciiTable(dict):
+    """str.translate table keeping printable ASCII (0x20-0x7E), filled in lazily per code point"""
+    
+    def __missing__(self, codepoint: int) -> Optional[int]:
+        value = codepoint if 0x20 <= codepoint <= 0x7E else None
+        self[codepoint] = value
+        return value
+
+
+_PRINTABLE_ASCII = _PrintableAsciiTable()
+
+
+class _NumericCharsTable(dict):
+    """str.translate table keeping decimal digits, '.' and '-' (same as deleting [^\\d.-]), filled in lazily"""
+    
+    def __missing__(self, codepoint: int) -> Optional[int]:
+        char = chr(codepoint)
+        value = codepoint if char.isdecimal() or char in '.-' else None
+        self[codepoint] = value
+        return value
+
+
+_NUMERIC_CHARS = _NumericCharsTable()
+
+_logger = get_logger('data_extractor')
 
 
 class DataExtractor:
@@ -11,45 +55,49 @@ class DataExtractor:
     
     def __init__(self):
         # Common column patterns for different data types
-        self.symbol_patterns = [
+        self.symbol_patterns = [re.compile(pattern) for pattern in (
             r'^[A-Z]{1,5}$',  # Standard ticker symbols
             r'^[A-Z]+\.[A-Z]+$',  # Exchange notation (e.g., AAPL.US)
-        ]
+        )]
         
-        self.price_patterns = [
+        self.price_patterns = [re.compile(pattern) for pattern in (
             r'[\d,]+\.?\d*',  # Numbers with commas and optional decimals
             r'\d+\.?\d*',     # Simple decimal numbers
-        ]
+        )]
         
-        self.percentage_patterns = [
+        self.percentage_patterns = [re.compile(pattern) for pattern in (
             r'[+-]?\d+\.?\d*%?',  # Percentage with optional % sign
             r'[+-]?\d+\.?\d*',    # Just the number
-        ]
+        )]
     
-    def extract_stock_data(self, row_element: Tag) -> Optional[StockData]:
-        """Extract stock data from a table row element"""
+    def extract_stock_data(self, row_element: Tag,
+                           timestamp: Optional[datetime] = None,
+                           column_map: Optional[Dict[str, int]] = None) -> Optional[StockData]:
+        """Extract stock data from a table row element, by header positions when column_map is given"""
         try:
-            cells = row_element.find_all(['td', 'th'])
+            cells = find_row_cells(row_element)
             if len(cells) < 3:
                 return None
             
-            # Extract text from all cells
-            cell_texts = [self._clean_cell_text(cell.get_text()) for cell in cells]
+            # Known header layout first, reading only the mapped cells
+            data_map = self._map_columns(cells, column_map) if column_map else None
             
-            # Try to identify data structure
-            data_map = self._identify_data_structure(cell_texts)
+            if data_map is None:
+                # Extract text from all cells and try to identify data structure
+                cell_texts = [self._clean_cell_text(cell.get_text()) for cell in cells]
+                data_map = self._identify_data_structure(cell_texts)
             
             if not data_map.get('symbol'):
                 return None
             
-            # Create StockData object
-            stock_data = StockData(
+            # Create StockData object; the parsers above only return values validate() accepts
+            stock_data = StockData.unchecked(
                 symbol=data_map['symbol'],
                 company_name=data_map.get('company_name'),
                 price=self._parse_price(data_map.get('price')),
                 change_percent=self._parse_percentage(data_map.get('change_percent')),
                 change_absolute=self._parse_price(data_map.get('change_absolute')),
-                timestamp=datetime.now(),
+                timestamp=timestamp or datetime.now(),
                 status='success' if data_map.get('price') else 'partial'
             )
             
@@ -63,39 +111,70 @@ class DataExtractor:
         if not text:
             return ""
         
-        # Remove extra whitespace and special characters
-        cleaned = re.sub(r'\s+', ' ', text.strip())
+        # Remove extra whitespace (split/join collapses runs and trims the ends)
+        cleaned = ' '.join(text.split())
         
         # Remove common HTML artifacts
-        cleaned = re.sub(r'&nbsp;|&amp;|&lt;|&gt;', ' ', cleaned)
+        if '&' in cleaned:
+            cleaned = _HTML_ENTITY_RE.sub(' ', cleaned)
         
-        # Remove non-printable characters
-        cleaned = re.sub(r'[^\x20-\x7E]', '', cleaned)
+        # Remove non-printable characters (plain ASCII text, the common case, has none)
+        if not (cleaned.isascii() and cleaned.isprintable()):
+            cleaned = cleaned.translate(_PRINTABLE_ASCII)
         
         return cleaned.strip()
     
+    def _map_columns(self, cells: List[Tag], column_map: Dict[str, int]) -> Optional[Dict[str, str]]:
+        """Pick cells by header position; None when the row does not fit the header layout"""
+        if max(column_map.values()) >= len(cells):
+            return None
+        
+        data_map = {}
+        for field_name, index in column_map.items():
+            text = self._clean_cell_text(cells[index].get_text())
+            if text and text != 'N/A':
+                data_map[field_name] = text
+        
+        # A shifted or malformed row falls back to per-cell classification
+        if not self._is_symbol(data_map.get('symbol', '')):
+            return None
+        return data_map
+    
     def _identify_data_structure(self, cell_texts: List[str]) -> Dict[str, str]:
         """Identify which cell contains which type of data"""
         data_map = {}
         
-        for i, text in enumerate(cell_texts):
+        for text in cell_texts:
             if not text or text == 'N/A':
                 continue
             
+            # One scan tells whether the cell is a symbol or starts like a number; the
+            # remaining checks reuse these flags instead of re-running each classifier
+            match = _CELL_KIND_RE.match(text.upper())
+            kind = match.lastgroup if match else None
+            is_symbol = kind == 'symbol'
+            
             # Identify symbol (usually first column or matches pattern)
-            if self._is_symbol(text) and 'symbol' not in data_map:
+            if is_symbol and 'symbol' not in data_map:
                 data_map['symbol'] = text
+                continue
+            
+            is_price = self._is_price(text)
+            is_percentage = '%' in text or (
+                kind == 'number' and (text.startswith(('+', '-')) or '.' in text)
+            )
             
             # Identify company name (usually longer text without numbers)
-            elif self._is_company_name(text) and 'company_name' not in data_map:
+            if (not is_symbol and not is_price and not is_percentage and len(text) > 3 and
+                    'company_name' not in data_map and any(c.isalpha() for c in text)):
                 data_map['company_name'] = text
             
             # Identify price (number with optional currency symbols)
-            elif self._is_price(text) and 'price' not in data_map:
+            elif is_price and 'price' not in data_map:
                 data_map['price'] = text
             
             # Identify percentage change
-            elif self._is_percentage(text):
+            elif is_percentage:
                 if 'change_percent' not in data_map:
                     data_map['change_percent'] = text
                 elif 'change_absolute' not in data_map:
@@ -110,7 +189,8 @@ class DataExtractor:
     
     def _is_symbol(self, text: str) -> bool:
         """Check if text looks like a stock symbol"""
-        return any(re.match(pattern, text.upper()) for pattern in self.symbol_patterns)
+        upper = text.upper()
+        return any(pattern.match(upper) for pattern in self.symbol_patterns)
     
     def _is_company_name(self, text: str) -> bool:
         """Check if text looks like a company name"""
@@ -124,7 +204,7 @@ class DataExtractor:
     def _is_price(self, text: str) -> bool:
         """Check if text looks like a price"""
         # Remove currency symbols and check if it's a number
-        cleaned = re.sub(r'[$€£¥₹,\s]', '', text)
+        cleaned = _CURRENCY_RE.sub('', text)
         try:
             float(cleaned)
             return True
@@ -134,7 +214,7 @@ class DataExtractor:
     def _is_percentage(self, text: str) -> bool:
         """Check if text looks like a percentage"""
         return '%' in text or (
-            any(re.match(pattern, text) for pattern in self.percentage_patterns) and
+            any(pattern.match(text) for pattern in self.percentage_patterns) and
             (text.startswith(('+', '-')) or '.' in text)
         )
     
@@ -152,9 +232,19 @@ class DataExtractor:
         if not price_str:
             return None
         
+        # Fast path for plain prices like "123.45" or "$1,234.56"; anything else
+        # (European decimals, signs, stray characters) takes the general route below
+        plain = price_str.translate(_PRICE_STRIP_TABLE)
+        if ',' in plain and '.' in plain and plain.rfind(',') < plain.rfind('.'):
+            plain = plain.replace(',', '')
+        integer_part, _, fraction = plain.partition('.')
+        if integer_part.isdecimal() and (not fraction or fraction.isdecimal()):
+            price = float(plain)
+            return price if price <= 1000000 else None
+        
         try:
             # Remove currency symbols, commas, and extra spaces
-            cleaned = re.sub(r'[$€£¥₹,\s]', '', price_str)
+            cleaned = _CURRENCY_RE.sub('', price_str)
             
             # Handle different decimal separators
             if ',' in cleaned and '.' in cleaned:
@@ -168,7 +258,7 @@ class DataExtractor:
                     cleaned = cleaned.replace(',', '.')
             
             # Remove any remaining non-numeric characters except decimal point and minus
-            cleaned = re.sub(r'[^\d.-]', '', cleaned)
+            cleaned = cleaned.translate(_NUMERIC_CHARS)
             
             if not cleaned:
                 return None
@@ -198,7 +288,7 @@ class DataExtractor:
             is_positive = cleaned.startswith('+') or 'green' in cleaned.lower()
             
             # Remove non-numeric characters except decimal point
-            numeric = re.sub(r'[^\d.-]', '', cleaned)
+            numeric = cleaned.translate(_NUMERIC_CHARS)
             
             if not numeric:
                 return None
@@ -249,17 +339,21 @@ class DataExtractor:
         except Exception:
             return False
     
-    def extract_multiple_stocks(self, row_elements: List[Tag]) -> List[StockData]:
-        """Extract data from multiple table rows"""
+    def extract_multiple_stocks(self, row_elements: List[Tag],
+                                column_map: Optional[Dict[str, int]] = None,
+                                timestamp: Optional[datetime] = None) -> List[StockData]:
+        """Extract data from multiple table rows, optionally using a header column map"""
         stocks = []
+        # Rows of one batch are scraped together, so they share a single timestamp
+        now = timestamp or datetime.now()
         
         for i, row in enumerate(row_elements):
             try:
-                stock_data = self.extract_stock_data(row)
+                stock_data = self.extract_stock_data(row, now, column_map)
                 if stock_data and self.validate_extracted_data(stock_data):
                     stocks.append(stock_data)
             except Exception as e:
-                print(f"Warning: Failed to extract data from row {i + 1}: {e}")
+                _logger.warning("Failed to extract data from row %d: %s", i + 1, e)
                 continue
         
         return stocks
\ No newline at end of file
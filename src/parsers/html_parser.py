@@ -1,14 +1,111 @@
-from bs4 import BeautifulSoup, Tag
+from bs4 import BeautifulSoup, SoupStrainer, Tag
 from typing import List, Optional, Dict, Any
+import functools
 import re
+import soupsieve
 from ..utils.errors import ParsingError
 
+try:
+    import lxml  # noqa: F401
+    _PARSER_FEATURES = 'lxml'
+except ImportError:  # Optional: C tree builder, falls back to the stdlib parser
+    _PARSER_FEATURES = 'html.parser'
+
+_CELL_TAGS = ('td', 'th')
+
+# parse_stock_table only looks inside tables, so the rest of the page is never built into the tree
+_TABLE_STRAINER = SoupStrainer('table')
+
+# Pagination indicators looked for in link hrefs, compiled once
+_PAGINATION_PATTERNS = [re.compile(pattern) for pattern in (
+    r'page=\d+',
+    r'p=\d+',
+    r'offset=\d+',
+    r'start=\d+',
+    r'next',
+    r'more'
+)]
+
+# Column header words; a row mentioning two or more of them is treated as a header
+_HEADER_INDICATORS = (
+    'symbol', 'ticker', 'name', 'company',
+    'price', 'last', 'close',
+    'change', 'chg', '%', 'percent',
+    'volume', 'vol'
+)
+
+# Header word -> StockData field, checked in order so "Change %" maps to the percentage column
+_HEADER_FIELDS = (
+    ('%', 'change_percent'), ('percent', 'change_percent'),
+    ('symbol', 'symbol'), ('ticker', 'symbol'),
+    ('company', 'company_name'), ('name', 'company_name'),
+    ('price', 'price'), ('last', 'price'), ('close', 'price'),
+    ('change', 'change_absolute'), ('chg', 'change_absolute'),
+)
+
+# Markers of JavaScript-rendered pages. One lower() copy plus C substring searches beats a
+# case-insensitive alternation regex here by about 10x on a 1 MB page
+_DYNAMIC_INDICATORS = (
+    'data-react',
+    'ng-app',
+    'vue-app',
+    'loading...',
+    'spinner',
+    'skeleton',
+    'placeholder',
+    'data-src',  # Lazy loading
+    'onload=',
+    'document.ready',
+    'ajax',
+    'fetch(',
+)
+
+
+def _build_soup(html_content: str, parse_only: Optional[SoupStrainer] = None) -> BeautifulSoup:
+    """Parse HTML content with BeautifulSoup, optionally keeping only what parse_only matches"""
+    try:
+        return BeautifulSoup(html_content, _PARSER_FEATURES, parse_only=parse_only)
+    except Exception as e:
+        raise ParsingError(f"Failed to parse HTML content: {e}")
+
+
+@functools.lru_cache(maxsize=64)
+def _compile_selector(selector: str) -> soupsieve.SoupSieve:
+    """Compile a CSS selector once; Tag.select() would re-resolve it on every call"""
+    return soupsieve.compile(selector)
+
+
+def _select_tables(selector: str, root: Tag) -> List[Tag]:
+    """Tables under root matching selector, including root itself when it is a matching table"""
+    compiled = _compile_selector(selector)
+    tables = compiled.select(root)
+    if root.name == 'table' and compiled.match(root):
+        tables.insert(0, root)
+    return tables
+
+
+def find_row_cells(row: Tag) -> List[Tag]:
+    """Return the td/th cells of a table row"""
+    # Plain name checks; find_all builds a filter object and match rules on every call
+    if _PARSER_FEATURES == 'lxml':
+        # lxml closes unterminated cells, so they are always direct children of the row
+        return [node for node in row.children if node.name in _CELL_TAGS]
+    # html.parser nests unclosed <td> tags, so the whole subtree has to be searched
+    return [node for node in row.descendants if node.name in _CELL_TAGS]
+
+
+def count_table_rows(table: Tag) -> int:
+    """Count the <tr> elements under a table without building a result list"""
+    return sum(1 for node in table.descendants if node.name == 'tr')
+
 
 class HTMLParser:
     """HTML parser with adaptive selectors and fallback mechanisms"""
     
     def __init__(self):
         self.soup = None
+        # Field -> column index read from the header of the last parsed table, if it had one
+        self.column_map: Optional[Dict[str, int]] = None
         # Multiple selector strategies for different page structures
         self.table_selectors = [
             'table.tab01',  # Common Stooq table class
@@ -35,45 +132,61 @@ class HTMLParser:
         ]
     
     def parse_html(self, html_content: str) -> BeautifulSoup:
-        """Parse HTML content with BeautifulSoup"""
-        try:
-            self.soup = BeautifulSoup(html_content, 'html.parser')
-            return self.soup
-        except Exception as e:
-            raise ParsingError(f"Failed to parse HTML content: {e}")
+        """Parse HTML content with BeautifulSoup and keep it as the current document"""
+        self.soup = _build_soup(html_content)
+        return self.soup
     
     def detect_dynamic_content(self, html_content: str) -> bool:
         """Detect if page contains JavaScript-loaded content"""
-        dynamic_indicators = [
-            'data-react',
-            'ng-app',
-            'vue-app',
-            'loading...',
-            'spinner',
-            'skeleton',
-            'placeholder',
-            'data-src',  # Lazy loading
-            'onload=',
-            'document.ready',
-            'ajax',
-            'fetch(',
-        ]
-        
         html_lower = html_content.lower()
-        return any(indicator in html_lower for indicator in dynamic_indicators)
+        return any(indicator in html_lower for indicator in _DYNAMIC_INDICATORS)
     
     def parse_stock_table(self, html_content: str) -> List[Tag]:
-        """Parse stock table with adaptive selectors"""
-        soup = self.parse_html(html_content)
+        """Parse stock table with adaptive selectors (self.soup, the current document, is left as is)"""
+        # Only <table> subtrees are kept, so ancestor selectors like 'div.table-responsive table'
+        # no longer match and those tables are picked up by the plain 'table' fallback instead.
+        # That partial tree stays local, so the self.soup lookups never see a page without its head
+        soup = _build_soup(html_content, parse_only=_TABLE_STRAINER)
+        return self.parse_table_rows(soup)
+    
+    def parse_table_rows(self, root: Tag) -> List[Tag]:
+        """Find stock rows in an already parsed document or <table> element, without re-parsing it"""
+        # Stooq fast path: its quote table is known, so the adaptive search is only a fallback
+        rows = self._stooq_table_rows(root) or self._adaptive_table_rows(root)
+        self.column_map = self._read_column_map(rows[0].find_parent('table'))
+        
+        # Filter out header rows and empty rows
+        data_rows = []
+        for row in rows:
+            cells = find_row_cells(row)
+            if len(cells) >= 3:  # Minimum columns for stock data
+                # Skip if it looks like a header
+                text_content = ' '.join(cell.get_text().strip() for cell in cells)
+                if not self._is_header_row(text_content):
+                    data_rows.append(row)
         
+        return data_rows
+    
+    def _stooq_table_rows(self, root: Tag) -> List[Tag]:
+        """Rows of Stooq's table.tab01, or an empty list when the page has no such table"""
+        tables = _select_tables('table.tab01', root)
+        if not tables:
+            return []
+        
+        table = max(tables, key=count_table_rows)
+        rows = _compile_selector('tbody tr').select(table) or _compile_selector('tr').select(table)
+        return rows if len(rows) > 1 else []  # Need more than just header
+    
+    def _adaptive_table_rows(self, root: Tag) -> List[Tag]:
+        """Find the stock table rows by trying every table and row selector in order"""
         # Try different table selectors
         table = None
         for selector in self.table_selectors:
             try:
-                tables = soup.select(selector)
+                tables = _select_tables(selector, root)
                 if tables:
                     # Find the table with most rows (likely the data table)
-                    table = max(tables, key=lambda t: len(t.find_all('tr')))
+                    table = max(tables, key=count_table_rows)
                     break
             except Exception:
                 continue
@@ -85,7 +198,7 @@ class HTMLParser:
         rows = []
         for selector in self.row_selectors:
             try:
-                found_rows = table.select(selector)
+                found_rows = _compile_selector(selector).select(table)
                 if found_rows and len(found_rows) > 1:  # Need more than just header
                     rows = found_rows
                     break
@@ -95,31 +208,45 @@ class HTMLParser:
         if not rows:
             raise ParsingError("Could not find table rows with any selector")
         
-        # Filter out header rows and empty rows
-        data_rows = []
-        for row in rows:
-            cells = row.find_all(['td', 'th'])
-            if len(cells) >= 3:  # Minimum columns for stock data
-                # Skip if it looks like a header
-                text_content = ' '.join(cell.get_text().strip() for cell in cells)
-                if not self._is_header_row(text_content):
-                    data_rows.append(row)
+        return rows
+    
+    def _read_column_map(self, table: Optional[Tag]) -> Optional[Dict[str, int]]:
+        """Map StockData fields to column positions using the table's header row, if it has one"""
+        if table is None:
+            return None
         
-        return data_rows
+        # The header is one of the first rows (or the only row in <thead>)
+        for row in _compile_selector('tr').select(table, limit=5):
+            header_texts = [cell.get_text().strip() for cell in find_row_cells(row)]
+            if self._is_header_row(' '.join(header_texts)):
+                return self._build_column_map(header_texts)
+        return None
+    
+    def _build_column_map(self, header_texts: List[str]) -> Optional[Dict[str, int]]:
+        """Map StockData fields to column positions from header texts; None without symbol and price"""
+        column_map = {}
+        for index, text in enumerate(header_texts):
+            text_lower = text.lower()
+            for indicator, field_name in _HEADER_FIELDS:
+                if indicator in text_lower:
+                    column_map.setdefault(field_name, index)
+                    break
+        
+        if 'symbol' not in column_map or 'price' not in column_map:
+            return None
+        return column_map
     
     def _is_header_row(self, text_content: str) -> bool:
         """Check if row appears to be a header"""
-        header_indicators = [
-            'symbol', 'ticker', 'name', 'company',
-            'price', 'last', 'close',
-            'change', 'chg', '%', 'percent',
-            'volume', 'vol'
-        ]
-        
         text_lower = text_content.lower()
-        # If contains multiple header indicators, likely a header
-        matches = sum(1 for indicator in header_indicators if indicator in text_lower)
-        return matches >= 2
+        # If contains multiple header indicators, likely a header; stop at the second hit
+        matches = 0
+        for indicator in _HEADER_INDICATORS:
+            if indicator in text_lower:
+                matches += 1
+                if matches >= 2:
+                    return True
+        return False
     
     def extract_pagination_links(self, html_content: str) -> List[str]:
         """Extract pagination links with fallback strategies"""
@@ -128,7 +255,7 @@ class HTMLParser:
         
         for selector in self.pagination_selectors:
             try:
-                elements = soup.select(selector)
+                elements = _compile_selector(selector).select(soup)
                 for element in elements:
                     href = element.get('href')
                     if href and self._is_valid_pagination_link(href):
@@ -137,12 +264,7 @@ class HTMLParser:
                 continue
         
         # Remove duplicates while preserving order
-        unique_links = []
-        for link in links:
-            if link not in unique_links:
-                unique_links.append(link)
-        
-        return unique_links
+        return list(dict.fromkeys(links))
     
     def _is_valid_pagination_link(self, href: str) -> bool:
         """Check if link is a valid pagination link"""
@@ -154,16 +276,8 @@ class HTMLParser:
             return False
         
         # Look for pagination indicators
-        pagination_patterns = [
-            r'page=\d+',
-            r'p=\d+',
-            r'offset=\d+',
-            r'start=\d+',
-            r'next',
-            r'more'
-        ]
-        
-        return any(re.search(pattern, href.lower()) for pattern in pagination_patterns)
+        href_lower = href.lower()
+        return any(pattern.search(href_lower) for pattern in _PAGINATION_PATTERNS)
     
     def wait_for_element(self, selector: str, timeout: int = 10) -> bool:
         """Check if element exists (for dynamic content detection)"""
@@ -171,7 +285,7 @@ class HTMLParser:
             return False
         
         try:
-            elements = self.soup.select(selector)
+            elements = _compile_selector(selector).select(self.soup)
             return len(elements) > 0
         except Exception:
             return False
@@ -194,7 +308,7 @@ class HTMLParser:
         
         for selector in selectors:
             try:
-                element = self.soup.select_one(selector)
+                element = _compile_selector(selector).select_one(self.soup)
                 if element:
                     return element
             except Exception:
@@ -220,7 +334,7 @@ class HTMLParser:
             if table.get('id'):
                 info['tables_with_ids'].append(table.get('id'))
             
-            row_count = len(table.find_all('tr'))
+            row_count = count_table_rows(table)
             info['max_rows_in_table'] = max(info['max_rows_in_table'], row_count)
         
         return info
\ No newline at end of file
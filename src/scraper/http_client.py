@@ -1,13 +1,45 @@
+import asyncio
 import requests
+from requests.adapters import HTTPAdapter
 import time
 import random
-from typing import Optional, Dict, List
-from ..utils.errors import ScrapingError
+from typing import Optional, Dict, List, Union
+
+try:
+    import aiohttp
+except ImportError:  # Optional: only required for get_many
+    aiohttp = None
+
+try:
+    import brotli  # noqa: F401
+    _ACCEPT_ENCODING = 'gzip, deflate, br'
+except ImportError:  # urllib3 can only decode Brotli responses when brotli is installed
+    _ACCEPT_ENCODING = 'gzip, deflate'
+
+from ..utils.errors import ScrapingError, NetworkError
+from ..utils.logger import get_logger
+
+
+_logger = get_logger('http_client')
+
+
+def conditional_headers(response_headers) -> Dict[str, str]:
+    """Build If-None-Match/If-Modified-Since request headers from a response's validators"""
+    validators = {}
+    if response_headers.get('ETag'):
+        validators['If-None-Match'] = response_headers['ETag']
+    if response_headers.get('Last-Modified'):
+        validators['If-Modified-Since'] = response_headers['Last-Modified']
+    return validators
 
 
 class HTTPClient:
     """HTTP client with retry mechanism and anti-bot measures"""
     
+    # All requests go to a single host, so one keep-alive pool is enough
+    POOL_CONNECTIONS = 1
+    POOL_MAXSIZE = 20
+    
     def __init__(self, max_retries: int = 3, base_delay: float = 1.0, timeout: int = 30):
         self.max_retries = max_retries
         self.base_delay = base_delay
@@ -24,18 +56,26 @@ class HTTPClient:
             "Mozilla/5.0 (compatible; StooqScraper/1.0)"
         ]
         
+        # Reuse keep-alive connections instead of a new TCP/TLS handshake per page.
+        # Retries stay in get_with_retry, so the adapter itself does not retry.
+        adapter = HTTPAdapter(pool_connections=self.POOL_CONNECTIONS, pool_maxsize=self.POOL_MAXSIZE,
+                              pool_block=False, max_retries=0)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        
         # Default headers
         self.session.headers.update({
             'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
             'Accept-Language': 'en-US,en;q=0.5',
-            'Accept-Encoding': 'gzip, deflate',
+            'Accept-Encoding': _ACCEPT_ENCODING,
             'Connection': 'keep-alive',
             'Upgrade-Insecure-Requests': '1',
         })
-    
-    def _rotate_user_agent(self):
-        """Rotate user agent to avoid detection"""
-        self.session.headers['User-Agent'] = random.choice(self.user_agents)
+        
+        # One ready-made header set per user agent, so rotating is a pick instead of a copy
+        self._header_variants = tuple(
+            {**self.session.headers, 'User-Agent': user_agent} for user_agent in self.user_agents
+        )
     
     def _calculate_delay(self, attempt: int) -> float:
         """Calculate exponential backoff delay"""
@@ -47,13 +87,10 @@ class HTTPClient:
         
         for attempt in range(self.max_retries + 1):
             try:
-                # Rotate user agent for each attempt
-                self._rotate_user_agent()
-                
-                # Merge custom headers with session headers
-                request_headers = self.session.headers.copy()
+                # Rotate user agent for each attempt, merging custom headers when given
+                request_headers = random.choice(self._header_variants)
                 if headers:
-                    request_headers.update(headers)
+                    request_headers = {**request_headers, **headers}
                 
                 # Make the request
                 response = self.session.get(
@@ -77,8 +114,8 @@ class HTTPClient:
                 
                 if attempt < self.max_retries:
                     delay = self._calculate_delay(attempt)
-                    print(f"Request failed (attempt {attempt + 1}/{self.max_retries + 1}): {e}")
-                    print(f"Retrying in {delay:.2f} seconds...")
+                    _logger.warning("Request failed (attempt %d/%d): %s. Retrying in %.2f seconds...",
+                                    attempt + 1, self.max_retries + 1, e, delay)
                     time.sleep(delay)
                 else:
                     break
@@ -86,6 +123,55 @@ class HTTPClient:
         # All retries failed
         raise ScrapingError(f"Failed to fetch {url} after {self.max_retries + 1} attempts. Last error: {last_exception}")
     
+    async def get_many(self, urls: List[str], concurrency_limit: int = 8,
+                       validators: Optional[Dict[str, Dict[str, str]]] = None) -> List[Union[str, None, Exception]]:
+        """Fetch several pages concurrently over one keep-alive aiohttp session
+        
+        When validators (url -> conditional headers) is given, each request sends the stored
+        headers, the mapping is updated from fresh responses, and an unchanged page (304) is
+        returned as None.
+        """
+        if aiohttp is None:
+            raise ScrapingError("Concurrent fetching requires aiohttp: pip install aiohttp")
+        
+        semaphore = asyncio.Semaphore(concurrency_limit)
+        headers = dict(self.session.headers)
+        headers['User-Agent'] = random.choice(self.user_agents)
+        timeout = aiohttp.ClientTimeout(total=self.timeout)
+        
+        # Results keep the order of urls; a page that failed every retry is returned as its exception
+        async with aiohttp.ClientSession(headers=headers, timeout=timeout) as session:
+            return await asyncio.gather(
+                *(self._get_async(session, semaphore, url, validators) for url in urls),
+                return_exceptions=True
+            )
+    
+    async def _get_async(self, session, semaphore: asyncio.Semaphore, url: str,
+                         validators: Optional[Dict[str, Dict[str, str]]] = None) -> Optional[str]:
+        """Fetch a single page, backing off between retries without blocking other fetches"""
+        last_exception = None
+        request_headers = validators.get(url) if validators is not None else None
+        
+        for attempt in range(self.max_retries + 1):
+            try:
+                async with semaphore:
+                    async with session.get(url, headers=request_headers, allow_redirects=True) as response:
+                        response.raise_for_status()
+                        if response.status == 304:
+                            return None
+                        if validators is not None:
+                            validators[url] = conditional_headers(response.headers)
+                        return await response.text()
+                        
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                last_exception = e
+                
+                if attempt < self.max_retries:
+                    await asyncio.sleep(self._calculate_delay(attempt))
+        
+        # The URL is carried in details, which str() appends, so the message leaves it out
+        raise NetworkError(f"Fetch failed after {self.max_retries + 1} attempts. Last error: {last_exception}", url=url)
+    
     def handle_rate_limit(self, response: requests.Response, attempt: int = 0):
         """Handle rate limiting with exponential backoff"""
         # Check for Retry-After header
@@ -100,7 +186,7 @@ class HTTPClient:
             # Use exponential backoff if no Retry-After header
             delay = self._calculate_delay(attempt)
         
-        print(f"Rate limited (HTTP 429). Waiting {delay} seconds before retry...")
+        _logger.warning("Rate limited (HTTP 429). Waiting %s seconds before retry...", delay)
         time.sleep(delay)
     
     def add_delay(self, custom_delay: Optional[float] = None):
@@ -1,49 +1,223 @@
+import multiprocessing
+import multiprocessing.util
+import queue
+import signal
 import time
 import re
-from typing import List, Optional, Dict, Any
+from typing import Callable, List, Optional, Dict, Any
 from datetime import datetime
-from selenium import webdriver
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.chrome.options import Options
-from selenium.common.exceptions import TimeoutException, NoSuchElementException, WebDriverException
+
+try:
+    import aiohttp
+except ImportError:  # Optional: only required for the concurrent HTTP path
+    aiohttp = None
 
 from .base import BaseScraper
-from .http_client import HTTPClient
+from .http_client import HTTPClient, conditional_headers
 from ..models.stock_data import StockData
 from ..parsers.html_parser import HTMLParser
 from ..parsers.data_extractor import DataExtractor
-from ..utils.errors import ScrapingError, NetworkError
+from ..utils.errors import ScrapingError, ParsingError, NetworkError
+
+
+# Text patterns used while scanning rendered pages, compiled once
+_SYMBOL_RE = re.compile(r'^[A-Z]{1,5}(?:\.[A-Z]+|-[A-Z])?$')  # AAPL, BRK.B, BF-B
+_SP500_SYMBOL_RE = re.compile(r'^[A-Z]{1,5}(\.[A-Z]+)?$')
+_PRICE_RES = (
+    re.compile(r'\$?(\d{1,4}(?:,\d{3})*(?:\.\d{2})?)'),
+    re.compile(r'(\d+\.\d{2})'),
+)
+_PERCENT_RES = (
+    re.compile(r'([+-]?\d+\.\d+)%'),
+    re.compile(r'([+-]?\d+)%'),
+)
+
+
+class _DriverPool:
+    """Keeps idle Chrome drivers alive between scrapes instead of starting a browser each time"""
+    
+    def __init__(self, factory: Callable[[], "webdriver.Chrome"], max_idle: int = 1):
+        self._factory = factory
+        self._idle = queue.Queue(maxsize=max_idle)
+    
+    def acquire(self) -> "webdriver.Chrome":
+        """Return a live idle driver, or start a new one"""
+        from selenium.common.exceptions import WebDriverException
+        
+        while True:
+            try:
+                driver = self._idle.get_nowait()
+            except queue.Empty:
+                return self._factory()
+            
+            try:
+                # Cheap round trip that fails if the browser died while idle
+                if driver.session_id is not None and driver.current_url is not None:
+                    return driver
+            except WebDriverException:
+                pass
+            self._quit(driver)
+    
+    def release(self, driver: "webdriver.Chrome"):
+        """Clear browsing state and keep the driver for the next scrape, or quit it"""
+        from selenium.common.exceptions import WebDriverException
+        
+        try:
+            driver.delete_all_cookies()
+            driver.execute_script("localStorage.clear(); sessionStorage.clear();")
+            self._idle.put_nowait(driver)
+        except (WebDriverException, queue.Full):
+            self._quit(driver)
+    
+    def shutdown(self):
+        """Quit every idle driver"""
+        while True:
+            try:
+                driver = self._idle.get_nowait()
+            except queue.Empty:
+                return
+            self._quit(driver)
+    
+    @staticmethod
+    def _quit(driver: "webdriver.Chrome"):
+        try:
+            driver.quit()
+        except Exception:
+            pass
+
+
+# Elements that show a quote page has rendered; ready once any selector matches more than 5
+_PAGE_READY_SELECTORS = [
+    "table", "tbody tr", "[class*='table']", "[id*='table']",
+    "[class*='stock']", "[class*='symbol']", "[class*='price']",
+    "a[href*='q/']", ".tab01", "#tab01", "tr td"
+]
+_PAGE_READY_SCRIPT = """
+for (const selector of arguments[0]) {
+    const count = document.querySelectorAll(selector).length;
+    if (count > 5) return [selector, count];
+}
+return null;
+"""
+
+# Third-party trackers, widgets and binary assets blocked at the network layer; none carry quote data
+_BLOCKED_URL_PATTERNS = [
+    "*googletagmanager*", "*google-analytics*", "*doubleclick*",
+    "*facebook*", "*twitter*",
+    "*.png", "*.jpg", "*.gif", "*.woff*",
+]
+
+# Per-process state of the parallel Selenium workers
+_worker_scraper = None
+_worker_stop = None
+
+
+def _init_selenium_worker(base_url: str, headless: bool, timeout: int, stop_event):
+    """Pool initializer: each worker process owns one scraper and, once needed, one Chrome"""
+    global _worker_scraper, _worker_stop
+    
+    # The parent handles Ctrl+C and shuts the pool down; workers must not run its cleanup
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+    
+    _worker_scraper = StooqScraper(base_url=base_url, headless=headless, timeout=timeout,
+                                   selenium_workers=1)
+    _worker_stop = stop_event
+    
+    # Quit Chrome when the pool retires this worker
+    multiprocessing.util.Finalize(None, _worker_scraper.close, exitpriority=10)
+
+
+def _scrape_url_in_worker(url: str):
+    """Scrape one URL (and its pagination for good sources) in a worker process"""
+    stats = {'pages_scraped': 0, 'urls_tried': 0, 'successful_extractions': 0, 'failed_extractions': 0}
+    if _worker_stop.is_set():
+        return url, [], [], stats, None
+    
+    try:
+        scraper = _worker_scraper
+        if scraper.driver is None:
+            scraper.driver = scraper._setup_driver()
+        
+        stocks = scraper._scrape_url_intensive(url, stats)
+        more_stocks = []
+        if len(stocks) >= 50 and not _worker_stop.is_set():
+            more_stocks = scraper._scrape_pagination_intensive(url, stats, should_stop=_worker_stop.is_set)
+        return url, stocks, more_stocks, stats, None
+        
+    except Exception as e:
+        stats['failed_extractions'] += 1
+        return url, [], [], stats, str(e)
 
 
 class StooqScraper(BaseScraper):
     """Intensive Selenium-based scraper for complete S&P 500 data from Stooq"""
     
+    # Unique stocks after which the intensive search stops looking at further sources
+    TARGET_STOCKS = 450
+    
     def __init__(self, base_url: str = "https://stooq.com/q/i/?s=^spx", 
-                 headless: bool = True, timeout: int = 30):
+                 headless: bool = True, timeout: int = 30,
+                 concurrency_limit: int = 8, max_retries: int = 3,
+                 delay: float = 1.0, selenium_workers: int = 1):
         self.base_url = base_url
         self.timeout = timeout
+        self.concurrency_limit = concurrency_limit
+        self.selenium_workers = selenium_workers
         self.driver = None
         self.html_parser = HTMLParser()
         self.data_extractor = DataExtractor()
-        self.http_client = HTTPClient()
-        
-        # Chrome options for headless browsing
-        self.chrome_options = Options()
-        if headless:
-            self.chrome_options.add_argument('--headless')
-        
-        # Anti-detection options
-        self.chrome_options.add_argument('--no-sandbox')
-        self.chrome_options.add_argument('--disable-dev-shm-usage')
-        self.chrome_options.add_argument('--disable-blink-features=AutomationControlled')
-        self.chrome_options.add_experimental_option("excludeSwitches", ["enable-automation"])
-        self.chrome_options.add_experimental_option('useAutomationExtension', False)
-        self.chrome_options.add_argument('--user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36')
-    
-    def _setup_driver(self) -> webdriver.Chrome:
+        self.http_client = HTTPClient(max_retries=max_retries, base_delay=delay, timeout=timeout)
+        self.session = self.http_client.session
+        
+        # Chrome options are built on first use so HTTP-only runs never import selenium
+        self.headless = headless
+        self._chrome_options = None
+        self._driver_pool = _DriverPool(self._setup_driver)
+        
+        # Validators and result of the last simple scrape, so an unchanged page is not parsed again
+        self._page_validators: Dict[str, str] = {}
+        self._cached_simple_result: Optional[List[StockData]] = None
+        
+        # The same per source URL for the concurrent path: url -> conditional headers / stocks found
+        self._concurrent_validators: Dict[str, Dict[str, str]] = {}
+        self._concurrent_pages: Dict[str, List[StockData]] = {}
+    
+    @property
+    def chrome_options(self):
+        """Chrome options for headless browsing with anti-detection measures"""
+        if self._chrome_options is None:
+            from selenium.webdriver.chrome.options import Options
+            
+            options = Options()
+            if self.headless:
+                options.add_argument('--headless')
+            
+            # Anti-detection options
+            options.add_argument('--no-sandbox')
+            options.add_argument('--disable-dev-shm-usage')
+            options.add_argument('--disable-blink-features=AutomationControlled')
+            options.add_experimental_option("excludeSwitches", ["enable-automation"])
+            options.add_experimental_option('useAutomationExtension', False)
+            options.add_argument('--user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36')
+            
+            # Only DOM text is scraped: skip images and notifications, and return from
+            # driver.get at DOMContentLoaded (the selector wait covers late tables)
+            options.add_experimental_option("prefs", {
+                "profile.managed_default_content_settings.images": 2,
+                "profile.default_content_setting_values.notifications": 2,
+            })
+            options.add_argument('--blink-settings=imagesEnabled=false')
+            options.page_load_strategy = 'eager'
+            self._chrome_options = options
+        
+        return self._chrome_options
+    
+    def _setup_driver(self) -> "webdriver.Chrome":
         """Setup Chrome WebDriver with anti-detection measures"""
+        from selenium import webdriver
+        from selenium.common.exceptions import WebDriverException
+        
         try:
             driver = webdriver.Chrome(options=self.chrome_options)
             
@@ -53,6 +227,13 @@ class StooqScraper(BaseScraper):
             # Set window size to appear more human-like
             driver.set_window_size(1920, 1080)
             
+            # Drop tracker, ad and asset requests before they reach the renderer
+            try:
+                driver.execute_cdp_cmd('Network.enable', {})
+                driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': _BLOCKED_URL_PATTERNS})
+            except WebDriverException as e:
+                print(f"⚠️ Could not block tracker URLs: {e}")
+            
             return driver
             
         except WebDriverException as e:
@@ -72,49 +253,142 @@ class StooqScraper(BaseScraper):
         except Exception as e:
             raise ScrapingError(f"Failed to fetch data: {e}")
     
+    async def fetch_data_async(self) -> List[StockData]:
+        """Fetch S&P 500 stock data requesting all source pages concurrently"""
+        if aiohttp is None:
+            print("⚠️ aiohttp not installed, using sequential HTTP scraping")
+            return self.fetch_data()
+        
+        try:
+            # Fetch every candidate URL at once instead of page by page
+            stocks = await self._try_concurrent_scraping()
+            if stocks and len(stocks) >= 100:
+                return stocks
+            
+            # Dynamic pages still need the intensive Selenium path
+            return self._selenium_scraping_intensive()
+            
+        except Exception as e:
+            raise ScrapingError(f"Failed to fetch data: {e}")
+    
+    async def _try_concurrent_scraping(self) -> Optional[List[StockData]]:
+        """Fetch all S&P 500 source URLs concurrently over plain HTTP"""
+        urls = self._get_sp500_urls()
+        print(f"🚀 Fetching {len(urls)} sources concurrently (limit: {self.concurrency_limit})...")
+        
+        pages = await self.http_client.get_many(urls, self.concurrency_limit,
+                                                validators=self._concurrent_validators)
+        
+        all_stocks = []
+        seen_symbols = set()
+        for url, page in zip(urls, pages):
+            if page is None:
+                # 304: the source is unchanged, reuse what it yielded last time
+                self._add_new_stocks(self._concurrent_pages.get(url, []), all_stocks, seen_symbols)
+                continue
+            
+            if isinstance(page, Exception):
+                # A NetworkError already names the URL in its details
+                print(f"❌ {page}" if isinstance(page, NetworkError) else f"❌ Failed to fetch {url}: {page}")
+                continue
+            
+            stocks = self._parse_concurrent_page(url, page)
+            if self._concurrent_validators.get(url):
+                self._concurrent_pages[url] = stocks
+            else:
+                self._concurrent_pages.pop(url, None)
+            self._add_new_stocks(stocks, all_stocks, seen_symbols)
+        
+        # Same final filtering as the Selenium paths, so every source returns comparable results
+        all_stocks = self._cleanup_and_validate_stocks(all_stocks)
+        if len(all_stocks) >= 100:
+            print(f"✅ Concurrent scraping successful: {len(all_stocks)} stocks found")
+            return all_stocks
+        
+        print(f"📊 Only {len(all_stocks)} stocks found, switching to intensive Selenium")
+        return None
+    
+    def _parse_concurrent_page(self, url: str, page: str) -> List[StockData]:
+        """Extract the stock table of one concurrently fetched page, or nothing for dynamic pages"""
+        if self.html_parser.detect_dynamic_content(page):
+            print(f"⚡ Dynamic content detected at {url}")
+            return []
+        
+        try:
+            rows = self.html_parser.parse_stock_table(page)
+        except ParsingError as e:
+            print(f"📊 No stock table at {url}: {e}")
+            return []
+        
+        return self.data_extractor.extract_multiple_stocks(rows, self.html_parser.column_map)
+    
     def _try_simple_scraping(self) -> Optional[List[StockData]]:
         """Try simple HTTP scraping first (faster)"""
         try:
             print("🚀 Attempting simple HTTP scraping...")
-            response = self.http_client.get_with_retry(self.base_url)
-            
-            # Check if content is dynamic
-            if self.html_parser.detect_dynamic_content(response.text):
-                print("⚡ Dynamic content detected, will use intensive Selenium")
-                return None
-            
-            # Parse with simple HTML parser
-            rows = self.html_parser.parse_stock_table(response.text)
-            if len(rows) < 50:  # Need more rows for S&P 500
-                print(f"📊 Only {len(rows)} rows found, switching to intensive Selenium")
-                return None
-            
-            stocks = self.data_extractor.extract_multiple_stocks(rows)
-            if len(stocks) >= 100:  # Good threshold for S&P 500
-                print(f"✅ Simple scraping successful: {len(stocks)} stocks found")
-                return stocks
-            
-            return None
+            # Conditional GET: the server answers 304 with no body when the page is unchanged
+            response = self.http_client.get_with_retry(self.base_url, headers=self._page_validators)
+            if response.status_code == 304:
+                print("♻️ Page unchanged since last scrape, reusing previous result")
+                return self._cached_simple_result
+            
+            stocks = self._parse_simple_page(response.text)
+            self._remember_simple_result(response, stocks)
+            return stocks
             
         except Exception as e:
             print(f"❌ Simple scraping failed: {e}")
             return None
     
+    def _parse_simple_page(self, html_content: str) -> Optional[List[StockData]]:
+        """Parse a statically served page, or return None when it needs Selenium"""
+        # Check if content is dynamic
+        if self.html_parser.detect_dynamic_content(html_content):
+            print("⚡ Dynamic content detected, will use intensive Selenium")
+            return None
+        
+        # Parse with simple HTML parser
+        rows = self.html_parser.parse_stock_table(html_content)
+        if len(rows) < 50:  # Need more rows for S&P 500
+            print(f"📊 Only {len(rows)} rows found, switching to intensive Selenium")
+            return None
+        
+        stocks = self.data_extractor.extract_multiple_stocks(rows, self.html_parser.column_map)
+        if len(stocks) >= 100:  # Good threshold for S&P 500
+            print(f"✅ Simple scraping successful: {len(stocks)} stocks found")
+            return stocks
+        
+        return None
+    
+    def _remember_simple_result(self, response, stocks: Optional[List[StockData]]):
+        """Keep the page's ETag/Last-Modified and the parsed result for the next conditional GET"""
+        validators = conditional_headers(response.headers)
+        self._page_validators = validators
+        self._cached_simple_result = stocks if validators else None
+    
     def _selenium_scraping_intensive(self) -> List[StockData]:
         """Use intensive Selenium scraping for complete S&P 500 data"""
         print("🚀 Starting INTENSIVE Selenium-based S&P 500 scraping...")
         
+        # Selenium is not thread-safe, so parallel scraping runs one Chrome per worker process.
+        # Those browsers live only for this call; the driver pool applies to the sequential path.
+        if self.selenium_workers > 1:
+            return self._scrape_intensive_parallel()
+        
         try:
-            self.driver = self._setup_driver()
+            # A browser kept from a previous scrape skips Chrome startup
+            self.driver = self._driver_pool.acquire()
             return self._scrape_intensive()
             
         finally:
             if self.driver:
-                self.driver.quit()
+                self._driver_pool.release(self.driver)
+                self.driver = None
     
     def _scrape_intensive(self) -> List[StockData]:
         """Main intensive scraping logic to find all S&P 500 stocks"""
         all_stocks = []
+        seen_symbols = set()
         scraping_stats = {
             'pages_scraped': 0,
             'urls_tried': 0,
@@ -134,26 +408,24 @@ class StooqScraper(BaseScraper):
                     print(f"\n--- 🔍 Trying S&P 500 source {i+1}/{len(sp500_urls)} ---")
                     print(f"URL: {url}")
                     
-                    stocks = self._scrape_url_intensive(url, scraping_stats)
+                    stocks = self._scrape_url_intensive(url, scraping_stats, seen_symbols)
                     
                     if stocks:
                         # Remove duplicates before adding
-                        new_stocks = self._filter_new_stocks(stocks, all_stocks)
-                        all_stocks.extend(new_stocks)
+                        new_count = self._add_new_stocks(stocks, all_stocks, seen_symbols)
                         
-                        print(f"✅ Found {len(stocks)} stocks ({len(new_stocks)} new)")
+                        print(f"✅ Found {len(stocks)} stocks ({new_count} new)")
                         print(f"📊 Total unique stocks so far: {len(all_stocks)}")
                         
                         # If we found a good source, try to get more from it
-                        if len(stocks) >= 50:
+                        if len(stocks) >= 50 and len(all_stocks) < self.TARGET_STOCKS:
                             print("🔥 Good source found! Trying pagination...")
                             more_stocks = self._scrape_pagination_intensive(url, scraping_stats)
-                            new_more = self._filter_new_stocks(more_stocks, all_stocks)
-                            all_stocks.extend(new_more)
-                            print(f"📄 Pagination added {len(new_more)} more stocks")
+                            new_more = self._add_new_stocks(more_stocks, all_stocks, seen_symbols)
+                            print(f"📄 Pagination added {new_more} more stocks")
                     
                     # Stop if we have enough stocks
-                    if len(all_stocks) >= 450:
+                    if len(all_stocks) >= self.TARGET_STOCKS:
                         print(f"🎯 TARGET REACHED! Found {len(all_stocks)} stocks!")
                         break
                         
@@ -174,6 +446,62 @@ class StooqScraper(BaseScraper):
             self._log_intensive_stats(scraping_stats, len(all_stocks), error=str(e))
             raise ScrapingError(f"Intensive S&P 500 scraping failed: {e}")
     
+    def _scrape_intensive_parallel(self) -> List[StockData]:
+        """Scrape the S&P 500 URLs concurrently, one Chrome per worker process"""
+        all_stocks = []
+        seen_symbols = set()
+        scraping_stats = {
+            'pages_scraped': 0,
+            'urls_tried': 0,
+            'successful_extractions': 0,
+            'failed_extractions': 0,
+            'start_time': time.time()
+        }
+        
+        sp500_urls = self._get_sp500_urls()
+        workers = min(self.selenium_workers, len(sp500_urls))
+        print(f"🎯 Target: Find all ~500 S&P 500 stocks ({workers} parallel browsers)")
+        
+        stop_event = multiprocessing.Event()
+        pool = multiprocessing.Pool(
+            workers, initializer=_init_selenium_worker,
+            initargs=(self.base_url, self.headless, self.timeout, stop_event)
+        )
+        
+        try:
+            for url, stocks, more_stocks, url_stats, error in pool.imap_unordered(_scrape_url_in_worker, sp500_urls):
+                for key, value in url_stats.items():
+                    scraping_stats[key] += value
+                
+                if error:
+                    print(f"❌ Failed to scrape {url}: {error}")
+                    continue
+                
+                if stocks:
+                    new_count = self._add_new_stocks(stocks, all_stocks, seen_symbols)
+                    new_more = self._add_new_stocks(more_stocks, all_stocks, seen_symbols)
+                    print(f"✅ {url}: {len(stocks)} stocks ({new_count} new), pagination added {new_more} more")
+                    print(f"📊 Total unique stocks so far: {len(all_stocks)}")
+                
+                # Stop if we have enough stocks; queued URLs then return without loading a page
+                if len(all_stocks) >= self.TARGET_STOCKS:
+                    print(f"🎯 TARGET REACHED! Found {len(all_stocks)} stocks!")
+                    break
+            
+            final_stocks = self._cleanup_and_validate_stocks(all_stocks)
+            self._log_intensive_stats(scraping_stats, len(final_stocks))
+            return final_stocks
+            
+        except Exception as e:
+            self._log_intensive_stats(scraping_stats, len(all_stocks), error=str(e))
+            raise ScrapingError(f"Intensive S&P 500 scraping failed: {e}")
+            
+        finally:
+            # Let workers exit normally so their finalizers quit Chrome (terminate() would orphan it)
+            stop_event.set()
+            pool.close()
+            pool.join()
+    
     def _get_sp500_urls(self) -> List[str]:
         """Get multiple potential S&P 500 URLs to try"""
         urls = [
@@ -193,10 +521,12 @@ class StooqScraper(BaseScraper):
             "https://stooq.com/q/i/?s=^spx&t=c&v=2",
         ]
         
-        return urls
+        # base_url may repeat one of the alternatives
+        return list(dict.fromkeys(urls))
     
-    def _scrape_url_intensive(self, url: str, stats: dict) -> List[StockData]:
-        """Intensively scrape a single URL"""
+    def _scrape_url_intensive(self, url: str, stats: dict,
+                              known_symbols: Optional[set] = None) -> List[StockData]:
+        """Intensively scrape a single URL, stopping early once known_symbols plus new ones reach the target"""
         try:
             print(f"🌐 Navigating to: {url}")
             self.driver.get(url)
@@ -205,26 +535,31 @@ class StooqScraper(BaseScraper):
             # Wait for page to load with multiple strategies
             self._wait_for_page_load_intensive()
             
-            # Try multiple extraction strategies
-            all_stocks = []
-            
-            print("📊 Strategy 1: Extract from all tables...")
-            table_stocks = self._extract_from_all_tables()
-            all_stocks.extend(table_stocks)
-            print(f"   Found {len(table_stocks)} stocks from tables")
-            
-            print("🔍 Strategy 2: Look for S&P 500 patterns...")
-            pattern_stocks = self._extract_sp500_patterns()
-            all_stocks.extend(pattern_stocks)
-            print(f"   Found {len(pattern_stocks)} stocks from patterns")
+            # Pull the rendered DOM over the WebDriver wire once; every strategy reads this copy
+            soup = self.html_parser.parse_html(self.driver.page_source)
             
-            print("🔗 Strategy 3: Extract from stock links...")
-            link_stocks = self._extract_from_stock_links()
-            all_stocks.extend(link_stocks)
-            print(f"   Found {len(link_stocks)} stocks from links")
+            # Try multiple extraction strategies; everything read from this page shares one timestamp
+            unique_stocks = []
+            page_symbols = set()
+            batch_ts = datetime.now()
             
-            # Remove duplicates from this URL
-            unique_stocks = self._remove_duplicate_stocks(all_stocks)
+            strategies = (
+                ("📊 Strategy 1: Extract from all tables...", self._extract_from_all_tables, "tables"),
+                ("🔍 Strategy 2: Look for S&P 500 patterns...", self._extract_sp500_patterns, "patterns"),
+                ("🔗 Strategy 3: Extract from stock links...", self._extract_from_stock_links, "links"),
+            )
+            for message, strategy, source in strategies:
+                print(message)
+                strategy_stocks = strategy(soup, batch_ts)
+                print(f"   Found {len(strategy_stocks)} stocks from {source}")
+                
+                # Duplicates from this URL are dropped as each strategy's results arrive
+                self._add_new_stocks(strategy_stocks, unique_stocks, page_symbols)
+                
+                # Later strategies cannot matter once the overall target is already covered
+                if known_symbols is not None and self._reaches_target(page_symbols, known_symbols):
+                    print("   🎯 Target covered, skipping remaining strategies")
+                    break
             
             stats['pages_scraped'] += 1
             stats['successful_extractions'] += len(unique_stocks)
@@ -237,28 +572,20 @@ class StooqScraper(BaseScraper):
     
     def _wait_for_page_load_intensive(self):
         """Wait for page to load with multiple strategies"""
+        from selenium.webdriver.support.ui import WebDriverWait
+        from selenium.common.exceptions import TimeoutException
+        
         try:
             wait = WebDriverWait(self.driver, self.timeout)
             
-            # Try multiple selectors
-            selectors_to_try = [
-                "table", "tbody tr", "[class*='table']", "[id*='table']",
-                "[class*='stock']", "[class*='symbol']", "[class*='price']",
-                "a[href*='q/']", ".tab01", "#tab01", "tr td"
-            ]
-            
-            element_found = False
-            for selector in selectors_to_try:
-                try:
-                    elements = wait.until(EC.presence_of_all_elements_located((By.CSS_SELECTOR, selector)))
-                    if len(elements) > 5:
-                        print(f"✅ Page loaded - found {len(elements)} elements")
-                        element_found = True
-                        break
-                except TimeoutException:
-                    continue
-            
-            if not element_found:
+            # Probe every selector in the page with one script per poll, instead of
+            # a separate wait (and its polling round trips) for each selector
+            try:
+                selector, count = wait.until(
+                    lambda driver: driver.execute_script(_PAGE_READY_SCRIPT, _PAGE_READY_SELECTORS)
+                )
+                print(f"✅ Page loaded - found {count} elements ({selector})")
+            except TimeoutException:
                 print("⚠️ No expected elements found, proceeding anyway")
             
             # Additional strategies
@@ -269,21 +596,23 @@ class StooqScraper(BaseScraper):
         except Exception as e:
             print(f"⚠️ Page load wait failed: {e}")
     
-    def _extract_from_all_tables(self) -> List[StockData]:
+    def _extract_from_all_tables(self, soup, batch_ts: datetime) -> List[StockData]:
         """Extract data from all tables on the page"""
         stocks = []
         
         try:
-            tables = self.driver.find_elements(By.TAG_NAME, "table")
+            tables = soup.find_all('table')
             print(f"   🔍 Found {len(tables)} tables")
             
             for i, table in enumerate(tables):
                 try:
-                    table_html = table.get_attribute('outerHTML')
-                    rows = self.html_parser.parse_stock_table(table_html)
+                    # Read the table in place; serialising and re-parsing it would hold a second copy
+                    rows = self.html_parser.parse_table_rows(table)
                     
                     if rows and len(rows) > 1:
-                        table_stocks = self.data_extractor.extract_multiple_stocks(rows)
+                        table_stocks = self.data_extractor.extract_multiple_stocks(
+                            rows, self.html_parser.column_map, batch_ts
+                        )
                         if table_stocks:
                             stocks.extend(table_stocks)
                             print(f"     📊 Table {i+1}: {len(table_stocks)} stocks")
@@ -296,7 +625,7 @@ class StooqScraper(BaseScraper):
         except Exception as e:
             return []
     
-    def _extract_sp500_patterns(self) -> List[StockData]:
+    def _extract_sp500_patterns(self, soup, batch_ts: datetime) -> List[StockData]:
         """Look for S&P 500 specific patterns"""
         stocks = []
         
@@ -309,13 +638,13 @@ class StooqScraper(BaseScraper):
             
             for selector in symbol_selectors:
                 try:
-                    elements = self.driver.find_elements(By.CSS_SELECTOR, selector)
+                    elements = soup.select(selector, limit=200)  # Reasonable limit
                     
-                    for element in elements[:200]:  # Reasonable limit
-                        text = element.text.strip().upper()
+                    for element in elements:
+                        text = element.get_text().strip().upper()
                         
                         if self._looks_like_stock_symbol(text):
-                            stock_data = self._create_stock_from_element(element, text)
+                            stock_data = self._create_stock_from_element(element, text, batch_ts)
                             if stock_data:
                                 stocks.append(stock_data)
                 
@@ -327,25 +656,25 @@ class StooqScraper(BaseScraper):
         except Exception:
             return []
     
-    def _extract_from_stock_links(self) -> List[StockData]:
+    def _extract_from_stock_links(self, soup, batch_ts: datetime) -> List[StockData]:
         """Extract from individual stock links"""
         stocks = []
         
         try:
-            stock_links = self.driver.find_elements(By.CSS_SELECTOR, "a[href*='/q/']")
+            stock_links = soup.select("a[href*='/q/']", limit=100)  # Reasonable limit
             
-            for link in stock_links[:100]:  # Reasonable limit
+            for link in stock_links:
                 try:
-                    text = link.text.strip().upper()
+                    text = link.get_text().strip().upper()
                     
                     if self._looks_like_stock_symbol(text):
-                        stock_data = StockData(
+                        stock_data = StockData.unchecked(
                             symbol=text,
                             company_name=None,
                             price=None,
                             change_percent=None,
                             change_absolute=None,
-                            timestamp=datetime.now(),
+                            timestamp=batch_ts,
                             status='partial'
                         )
                         stocks.append(stock_data)
@@ -364,19 +693,13 @@ class StooqScraper(BaseScraper):
             return False
         
         # Stock symbol patterns
-        patterns = [
-            r'^[A-Z]{1,5}$',
-            r'^[A-Z]{1,5}\.[A-Z]+$',
-            r'^[A-Z]{1,5}-[A-Z]$',
-        ]
-        
-        return any(re.match(pattern, text) for pattern in patterns)
+        return _SYMBOL_RE.match(text) is not None
     
-    def _create_stock_from_element(self, element, symbol: str) -> Optional[StockData]:
+    def _create_stock_from_element(self, element, symbol: str, batch_ts: datetime) -> Optional[StockData]:
         """Create stock data from element"""
         try:
-            parent = element.find_element(By.XPATH, "./..")
-            row_text = parent.text
+            parent = element.parent
+            row_text = parent.get_text(' ')
             
             price = self._extract_price_from_text(row_text)
             change_percent = self._extract_percentage_from_text(row_text)
@@ -387,7 +710,7 @@ class StooqScraper(BaseScraper):
                 price=price,
                 change_percent=change_percent,
                 change_absolute=None,
-                timestamp=datetime.now(),
+                timestamp=batch_ts,
                 status='success' if price else 'partial'
             )
             
@@ -397,13 +720,8 @@ class StooqScraper(BaseScraper):
     def _extract_price_from_text(self, text: str) -> Optional[float]:
         """Extract price from text"""
         try:
-            price_patterns = [
-                r'\$?(\d{1,4}(?:,\d{3})*(?:\.\d{2})?)',
-                r'(\d+\.\d{2})',
-            ]
-            
-            for pattern in price_patterns:
-                matches = re.findall(pattern, text)
+            for pattern in _PRICE_RES:
+                matches = pattern.findall(text)
                 for match in matches:
                     try:
                         clean_price = match.replace(',', '')
@@ -421,13 +739,8 @@ class StooqScraper(BaseScraper):
     def _extract_percentage_from_text(self, text: str) -> Optional[float]:
         """Extract percentage from text"""
         try:
-            percent_patterns = [
-                r'([+-]?\d+\.\d+)%',
-                r'([+-]?\d+)%',
-            ]
-            
-            for pattern in percent_patterns:
-                matches = re.findall(pattern, text)
+            for pattern in _PERCENT_RES:
+                matches = pattern.findall(text)
                 for match in matches:
                     try:
                         percent = float(match)
@@ -441,8 +754,11 @@ class StooqScraper(BaseScraper):
         except Exception:
             return None
     
-    def _scrape_pagination_intensive(self, base_url: str, stats: dict) -> List[StockData]:
-        """Scrape pagination pages"""
+    def _scrape_pagination_intensive(self, base_url: str, stats: dict,
+                                     should_stop: Optional[Callable[[], bool]] = None) -> List[StockData]:
+        """Scrape pagination pages, stopping before the next page once should_stop() is true"""
+        from selenium.webdriver.common.by import By
+        
         all_stocks = []
         
         try:
@@ -466,13 +782,19 @@ class StooqScraper(BaseScraper):
             print(f"   🔗 Found {len(pagination_links)} pagination links")
             
             for i, link in enumerate(pagination_links[:5]):  # Limit pages
+                if should_stop is not None and should_stop():
+                    print("   🛑 Target reached elsewhere, skipping remaining pagination")
+                    break
+                
                 try:
                     print(f"   📄 Page {i+1}: {link}")
                     
                     self.driver.get(link)
                     self._wait_for_page_load_intensive()
                     
-                    page_stocks = self._extract_from_all_tables()
+                    page_stocks = self._extract_from_all_tables(
+                        self.html_parser.parse_html(self.driver.page_source), datetime.now()
+                    )
                     if page_stocks:
                         all_stocks.extend(page_stocks)
                         print(f"     ✅ Got {len(page_stocks)} stocks")
@@ -488,58 +810,48 @@ class StooqScraper(BaseScraper):
         except Exception:
             return []
     
-    def _filter_new_stocks(self, new_stocks: List[StockData], existing_stocks: List[StockData]) -> List[StockData]:
-        """Filter out stocks that already exist"""
-        existing_symbols = {stock.symbol for stock in existing_stocks if stock.symbol}
-        return [stock for stock in new_stocks if stock.symbol and stock.symbol not in existing_symbols]
-    
-    def _remove_duplicate_stocks(self, stocks: List[StockData]) -> List[StockData]:
-        """Remove duplicates within a list"""
-        seen_symbols = set()
-        unique_stocks = []
-        
-        for stock in stocks:
+    def _add_new_stocks(self, new_stocks: List[StockData], all_stocks: List[StockData],
+                        seen_symbols: set) -> int:
+        """Append stocks whose symbol is not in seen_symbols (updating it) and return how many were added"""
+        added = 0
+        for stock in new_stocks:
             if stock.symbol and stock.symbol not in seen_symbols:
                 seen_symbols.add(stock.symbol)
-                unique_stocks.append(stock)
-        
-        return unique_stocks
+                all_stocks.append(stock)
+                added += 1
+        return added
+    
+    def _reaches_target(self, page_symbols: set, known_symbols: set) -> bool:
+        """Check whether known_symbols plus the new page_symbols reach TARGET_STOCKS"""
+        return len(known_symbols) + len(page_symbols - known_symbols) >= self.TARGET_STOCKS
     
     def _cleanup_and_validate_stocks(self, stocks: List[StockData]) -> List[StockData]:
-        """Final cleanup and validation"""
+        """Final cleanup and validation, deduplicating and validating in a single pass"""
         print(f"\n🧹 Cleaning up {len(stocks)} stocks...")
         
-        # Remove duplicates
-        unique_stocks = self._remove_duplicate_stocks(stocks)
-        print(f"   Removed {len(stocks) - len(unique_stocks)} duplicates")
-        
-        # Validate and clean
+        seen_symbols = set()
         valid_stocks = []
-        for stock in unique_stocks:
-            if self._is_valid_sp500_stock(stock):
-                valid_stocks.append(stock)
+        duplicates = 0
+        
+        for stock in stocks:
+            symbol = stock.symbol.upper() if isinstance(stock.symbol, str) else None
+            if symbol in seen_symbols:
+                duplicates += 1
+                continue
+            
+            # Invalid entries are not marked as seen, so a later valid copy can still be kept
+            if not symbol or len(symbol) > 10 or not _SP500_SYMBOL_RE.match(symbol):
+                continue
+            if stock.price is not None and not 0 < stock.price <= 10000:
+                continue
+            
+            seen_symbols.add(symbol)
+            valid_stocks.append(stock)
         
+        print(f"   Removed {duplicates} duplicates")
         print(f"   {len(valid_stocks)} stocks passed validation")
         return valid_stocks
     
-    def _is_valid_sp500_stock(self, stock: StockData) -> bool:
-        """Validate stock data"""
-        try:
-            if not stock.symbol or len(stock.symbol) > 10:
-                return False
-            
-            if stock.price is not None:
-                if stock.price <= 0 or stock.price > 10000:
-                    return False
-            
-            if not re.match(r'^[A-Z]{1,5}(\.[A-Z]+)?$', stock.symbol.upper()):
-                return False
-            
-            return True
-            
-        except Exception:
-            return False
-    
     def _log_intensive_stats(self, stats: dict, total_stocks: int, error: str = None):
         """Log intensive scraping statistics"""
         elapsed_time = time.time() - stats['start_time']
@@ -569,10 +881,16 @@ class StooqScraper(BaseScraper):
         
         print("="*60 + "\n")
     
+    def shutdown_pool(self):
+        """Quit the Chrome drivers kept alive between scrapes"""
+        self._driver_pool.shutdown()
+    
     def close(self):
         """Clean up resources"""
         if self.driver:
             self.driver.quit()
+            self.driver = None
+        self.shutdown_pool()
         if self.http_client:
             self.http_client.close()
     
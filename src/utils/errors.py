@@ -1,6 +1,11 @@
 """Custom exception classes for the scraper"""
 
 
+def _known(**fields) -> dict:
+    """Details dict holding only the fields that were actually given"""
+    return {key: value for key, value in fields.items() if value is not None}
+
+
 class ScrapingError(Exception):
     """Base exception for scraping-related errors"""
     
@@ -8,12 +13,17 @@ class ScrapingError(Exception):
         super().__init__(message)
         self.message = message
         self.details = details or {}
+        self._str = None
     
     def __str__(self):
-        if self.details:
-            details_str = ", ".join(f"{k}={v}" for k, v in self.details.items())
-            return f"{self.message} | Details: {details_str}"
-        return self.message
+        # Errors are often printed and logged more than once, so the text is built on first use
+        if self._str is None:
+            if self.details:
+                details_str = ", ".join(f"{k}={v}" for k, v in self.details.items())
+                self._str = f"{self.message} | Details: {details_str}"
+            else:
+                self._str = self.message
+        return self._str
 
 
 class DataExtractionError(ScrapingError):
@@ -42,9 +52,8 @@ class ConfigurationError(Exception):
 class NetworkError(ScrapingError):
     """Exception raised for network-related issues"""
     
-    def __init__(self, message: str, url: str = None, status_code: int = None):
-        super().__init__(message)
-        self.message = message
+    def __init__(self, message: str, url: str = None, status_code: int = None, details: dict = None):
+        super().__init__(message, {**_known(url=url, status_code=status_code), **(details or {})})
         self.url = url
         self.status_code = status_code
 
@@ -53,8 +62,7 @@ class ParsingError(ScrapingError):
     """Exception raised when HTML parsing fails"""
     
     def __init__(self, message: str, selector: str = None, page_url: str = None):
-        super().__init__(message)
-        self.message = message
+        super().__init__(message, _known(selector=selector, page_url=page_url))
         self.selector = selector
         self.page_url = page_url
 
@@ -63,8 +71,7 @@ class ValidationError(ScrapingError):
     """Exception raised when data validation fails"""
     
     def __init__(self, message: str, field: str = None, value: str = None):
-        super().__init__(message)
-        self.message = message
+        super().__init__(message, _known(field=field, value=value))
         self.field = field
         self.value = value
 
@@ -73,8 +80,7 @@ class SeleniumError(ScrapingError):
     """Exception raised for Selenium-related issues"""
     
     def __init__(self, message: str, action: str = None, element: str = None):
-        super().__init__(message)
-        self.message = message
+        super().__init__(message, _known(action=action, element=element))
         self.action = action
         self.element = element
 
@@ -83,8 +89,7 @@ class RateLimitError(NetworkError):
     """Exception raised when rate limited by server"""
     
     def __init__(self, message: str, retry_after: int = None):
-        super().__init__(message)
-        self.message = message
+        super().__init__(message, details=_known(retry_after=retry_after))
         self.retry_after = retry_after
 
 
@@ -92,6 +97,5 @@ class TimeoutError(ScrapingError):
     """Exception raised when operations timeout"""
     
     def __init__(self, message: str, timeout_seconds: int = None):
-        super().__init__(message)
-        self.message = message
+        super().__init__(message, _known(timeout_seconds=timeout_seconds))
         self.timeout_seconds = timeout_seconds
\ No newline at end of file
@@ -1,37 +1,184 @@
+import atexit
+import collections
+import dataclasses
 import logging
+import logging.handlers
 import os
+import queue
 import sys
-from datetime import datetime
-from typing import Dict, Any, Optional
+import time
+import types
+import weakref
+from datetime import datetime, timedelta
+from typing import Dict, Any, Mapping, NamedTuple, Optional
 from pathlib import Path
 
+from ..models.stock_data import DATACLASS_SLOTS
+
+
+def get_logger(name: str) -> logging.Logger:
+    """Get a module logger that emits through the application's StooqScraper handlers"""
+    return logging.getLogger(f"StooqScraper.{name}")
+
+
+# File log line layout used unless the config sets log_format
+DEFAULT_LOG_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+
+# Rule framing the session statistics report
+_BANNER = "=" * 60
+
+# Errors/warnings kept in the stats ring buffers; older entries are only counted
+MAX_TRACKED_MESSAGES = 1000
+
+
+# Shared read-only details for the common entry logged without keyword context
+_NO_DETAILS = types.MappingProxyType({})
+
+
+class LogEntry(NamedTuple):
+    """One tracked warning or error in the session stats"""
+    message: str
+    exception: Optional[str]
+    timestamp: float
+    details: Mapping[str, Any]
+    level: str
+
+
+def _tracked_messages() -> collections.deque:
+    """Ring buffer for tracked errors or warnings"""
+    return collections.deque(maxlen=MAX_TRACKED_MESSAGES)
+
+
+@dataclasses.dataclass(**DATACLASS_SLOTS)
+class ScraperStats:
+    """Session statistics; only the most recent errors and warnings are kept"""
+    start_time: Optional[float] = None
+    end_time: Optional[float] = None
+    total_requests: int = 0
+    successful_requests: int = 0
+    failed_requests: int = 0
+    total_stocks_extracted: int = 0
+    pages_scraped: int = 0
+    error_count: int = 0
+    warning_count: int = 0
+    errors: collections.deque = dataclasses.field(default_factory=_tracked_messages)
+    warnings: collections.deque = dataclasses.field(default_factory=_tracked_messages)
+
+
+def _iso(timestamp: float) -> str:
+    """Format a time.time() value for display; stats keep raw floats until they are shown"""
+    return datetime.fromtimestamp(timestamp).isoformat()
+
+
+def _entry_dict(entry: LogEntry) -> Dict[str, Any]:
+    """Tracked entry as the plain dict get_stats_summary reports, with an ISO timestamp"""
+    return {**entry._asdict(), 'timestamp': _iso(entry.timestamp), 'details': dict(entry.details)}
+
+
+def _render(message: str, args: tuple) -> str:
+    """Apply %-style args to a message the way logging does"""
+    return message % args if args else message
+
+
+def _context_suffix(context: Optional[Dict[str, Any]], exception: Optional[Exception] = None) -> str:
+    """Render " | key=value" context parts and the exception the way ScraperLogger messages end"""
+    parts = [f"{k}={v}" for k, v in context.items()] if context else []
+    if exception:
+        parts.append(f"Exception: {str(exception)}")
+    return ''.join(f" | {part}" for part in parts)
+
+
+class _ContextFormatter(logging.Formatter):
+    """Formatter that appends a record's ScraperLogger context only when the record is written"""
+    
+    def formatMessage(self, record: logging.LogRecord) -> str:
+        # record.message is recomputed by every format() call, so extending it here is per-handler
+        suffix = _context_suffix(getattr(record, 'context', None), getattr(record, 'context_exception', None))
+        if suffix:
+            record.message += suffix
+        return super().formatMessage(record)
+
+
+class _DefaultFormatFormatter(_ContextFormatter):
+    """_ContextFormatter for DEFAULT_LOG_FORMAT that builds the line with one f-string"""
+    
+    def __init__(self):
+        super().__init__(DEFAULT_LOG_FORMAT)
+        # (whole second, strftime text) of the last record; consecutive records mostly share it
+        self._second_text = (None, '')
+    
+    def formatTime(self, record: logging.LogRecord, datefmt: Optional[str] = None) -> str:
+        second = int(record.created)
+        cached_second, text = self._second_text
+        if second != cached_second:
+            text = time.strftime(self.default_time_format, self.converter(record.created))
+            self._second_text = (second, text)
+        return self.default_msec_format % (text, record.msecs)
+    
+    def formatMessage(self, record: logging.LogRecord) -> str:
+        # Same output as the generic %-style substitution, without its per-record dict lookups
+        suffix = _context_suffix(getattr(record, 'context', None), getattr(record, 'context_exception', None))
+        return f"{record.asctime} - {record.name} - {record.levelname} - {record.message}{suffix}"
+
+
+class _BufferedFileHandler(logging.FileHandler):
+    """FileHandler that lets a 64 KB buffer batch writes instead of flushing after every record"""
+    
+    buffer_size = 64 * 1024
+    
+    def __init__(self, filename: str, encoding: Optional[str] = None):
+        # Forked workers turn this on, since they exit without closing their handlers
+        self.autoflush = False
+        super().__init__(filename, encoding=encoding)
+    
+    def _open(self):
+        return open(self.baseFilename, self.mode, buffering=self.buffer_size,
+                    encoding=self.encoding, errors=self.errors)
+    
+    def flush(self):
+        """Flush only in autoflush mode; close() still writes out whatever is buffered"""
+        if self.autoflush:
+            super().flush()
+    
+    def emit(self, record: logging.LogRecord):
+        """Buffer the record, but write errors out at once so a crash cannot swallow them"""
+        super().emit(record)
+        if record.levelno >= logging.ERROR:
+            self.flush_buffer()
+    
+    def flush_buffer(self):
+        """Write out buffered records now"""
+        logging.StreamHandler.flush(self)
+
 
 class ScraperLogger:
     """Logging system using built-in logging module"""
     
+    __slots__ = ('name', 'logger', 'stats', '_level', '_queue_listener', '__weakref__')
+    
     def __init__(self, name: str = "StooqScraper"):
         self.name = name
         self.logger = None
-        self.stats = {
-            'start_time': None,
-            'end_time': None,
-            'total_requests': 0,
-            'successful_requests': 0,
-            'failed_requests': 0,
-            'total_stocks_extracted': 0,
-            'pages_scraped': 0,
-            'errors': [],
-            'warnings': []
-        }
+        self._level = logging.INFO
+        # Background thread that owns the file handler, so disk writes stay off the scraping path
+        self._queue_listener: Optional[logging.handlers.QueueListener] = None
+        self.stats = ScraperStats()
+        _LIVE_LOGGERS.add(self)
     
     def setup_logging(self, config: Dict[str, Any]):
         """Setup logging configuration"""
         try:
+            # Resolve the level name once; the logger and every handler share it
+            self._level = getattr(logging, config.get('log_level', 'INFO'))
+            
             # Create logger
             self.logger = logging.getLogger(self.name)
-            self.logger.setLevel(getattr(logging, config.get('log_level', 'INFO')))
+            self.logger.setLevel(self._level)
             
-            # Clear existing handlers
+            # Clear existing handlers (draining records queued for a previous file handler)
+            self.shutdown()
+            for handler in self.logger.handlers:
+                handler.close()
             self.logger.handlers.clear()
             
             # Setup file handler if log_file is specified
@@ -57,34 +204,83 @@ class ScraperLogger:
         log_file = config['log_file']
         
         try:
-            # Ensure log directory exists
+            # Ensure log directory exists (reconfiguring usually finds it already there)
             log_path = Path(log_file)
-            log_path.parent.mkdir(parents=True, exist_ok=True)
+            if not log_path.parent.is_dir():
+                log_path.parent.mkdir(parents=True, exist_ok=True)
             
             # Create file handler
-            file_handler = logging.FileHandler(log_file, encoding='utf-8')
-            file_handler.setLevel(getattr(logging, config.get('log_level', 'INFO')))
+            file_handler = _BufferedFileHandler(log_file, encoding='utf-8')
+            file_handler.setLevel(self._level)
             
             # Set formatter
-            formatter = logging.Formatter(
-                config.get('log_format', '%(asctime)s - %(name)s - %(levelname)s - %(message)s')
-            )
+            log_format = config.get('log_format', DEFAULT_LOG_FORMAT)
+            if log_format == DEFAULT_LOG_FORMAT:
+                formatter = _DefaultFormatFormatter()
+            else:
+                formatter = _ContextFormatter(log_format)
             file_handler.setFormatter(formatter)
             
-            self.logger.addHandler(file_handler)
+            # The logger only enqueues records; the listener thread formats and writes them
+            log_queue = queue.SimpleQueue()
+            self._queue_listener = logging.handlers.QueueListener(
+                log_queue, file_handler, respect_handler_level=True
+            )
+            self._queue_listener.start()
+            
+            self.logger.addHandler(logging.handlers.QueueHandler(log_queue))
             
         except Exception as e:
             print(f"Failed to setup file logging: {e}")
     
+    def shutdown(self):
+        """Write out queued file log records and stop the background listener
+        
+        Records logged afterwards (e.g. by a second cleanup) are written to the file directly.
+        """
+        listener, self._queue_listener = self._queue_listener, None
+        if listener is None:
+            return
+        
+        listener.stop()
+        self._attach_file_handlers(listener)
+    
+    def _flush_before_fork(self):
+        """Empty the file buffer so a forked child does not inherit, and later repeat, its records"""
+        if self._queue_listener is not None:
+            for handler in self._queue_listener.handlers:
+                if isinstance(handler, _BufferedFileHandler):
+                    handler.flush_buffer()
+    
+    def _write_directly_after_fork(self):
+        """Forked workers have no listener thread, so they go back to writing the file themselves"""
+        listener, self._queue_listener = self._queue_listener, None
+        if listener is not None:
+            self._attach_file_handlers(listener)
+    
+    def _attach_file_handlers(self, listener: logging.handlers.QueueListener):
+        """Replace the queue handler with the listener's handlers, flushing after every record"""
+        if self.logger is None:
+            return
+        
+        for handler in list(self.logger.handlers):
+            if isinstance(handler, logging.handlers.QueueHandler):
+                self.logger.removeHandler(handler)
+        for handler in listener.handlers:
+            if isinstance(handler, _BufferedFileHandler):
+                handler.autoflush = True
+            handler.flush()
+            self.logger.addHandler(handler)
+    
     def _setup_console_handler(self, config: Dict[str, Any]):
         """Setup console logging handler"""
         try:
             # Create console handler
             console_handler = logging.StreamHandler(sys.stdout)
-            console_handler.setLevel(getattr(logging, config.get('log_level', 'INFO')))
+            console_handler.setLevel(self._level)
             
             # Set formatter (simpler for console)
-            formatter = logging.Formatter('%(levelname)s - %(message)s')
+            formatter = _ContextFormatter('%(levelname)s - %(message)s')
             console_handler.setFormatter(formatter)
             
             self.logger.addHandler(console_handler)
@@ -94,168 +290,155 @@ class ScraperLogger:
     
     def _setup_fallback_logging(self):
         """Setup basic fallback logging"""
-        logging.basicConfig(
-            level=logging.INFO,
-            format='%(asctime)s - %(levelname)s - %(message)s'
-        )
+        handler = logging.StreamHandler()
+        handler.setFormatter(_ContextFormatter('%(asctime)s - %(levelname)s - %(message)s'))
+        logging.basicConfig(level=logging.INFO, handlers=[handler])
         self.logger = logging.getLogger(self.name)
     
-    def debug(self, message: str, **kwargs):
-        """Log debug message"""
+    def debug(self, message: str, *args, exception: Optional[Exception] = None, **kwargs):
+        """Log debug message (%-style args are formatted only if the record is emitted)"""
         if self.logger:
-            self.logger.debug(self._format_message(message, **kwargs))
+            # Context rides on the record and is only rendered by handlers that write it
+            if self.logger.isEnabledFor(logging.DEBUG):
+                self.logger.debug(message, *args, extra={'context': kwargs, 'context_exception': exception})
         else:
-            print(f"DEBUG: {message}")
+            print(f"DEBUG: {_render(message, args)}{_context_suffix(None, exception)}")
     
-    def info(self, message: str, **kwargs):
-        """Log info message"""
+    def info(self, message: str, *args, exception: Optional[Exception] = None, **kwargs):
+        """Log info message (%-style args are formatted only if the record is emitted)"""
         if self.logger:
-            self.logger.info(self._format_message(message, **kwargs))
+            if self.logger.isEnabledFor(logging.INFO):
+                self.logger.info(message, *args, extra={'context': kwargs, 'context_exception': exception})
         else:
-            print(f"INFO: {message}")
+            print(f"INFO: {_render(message, args)}{_context_suffix(None, exception)}")
     
-    def warning(self, message: str, **kwargs):
-        """Log warning message"""
+    def warning(self, message: str, *args, exception: Optional[Exception] = None, **kwargs):
+        """Log warning message (%-style args are formatted only if the record is emitted)"""
         if self.logger:
-            self.logger.warning(self._format_message(message, **kwargs))
+            if self.logger.isEnabledFor(logging.WARNING):
+                self.logger.warning(message, *args, extra={'context': kwargs, 'context_exception': exception})
         else:
-            print(f"WARNING: {message}")
+            print(f"WARNING: {_render(message, args)}{_context_suffix(None, exception)}")
         
         # Track warning
-        self.stats['warnings'].append({
-            'message': message,
-            'timestamp': datetime.now().isoformat(),
-            'details': kwargs
-        })
-    
-    def error(self, message: str, exception: Optional[Exception] = None, **kwargs):
-        """Log error message"""
-        full_message = self._format_message(message, **kwargs)
-        
-        if exception:
-            full_message += f" | Exception: {str(exception)}"
-        
+        self.stats.warning_count += 1
+        self.stats.warnings.append(self._entry('WARNING', message, args, exception, kwargs))
+    
+    def error(self, message: str, *args, exception: Optional[Exception] = None, **kwargs):
+        """Log error message (%-style args are formatted only if the record is emitted)"""
         if self.logger:
-            self.logger.error(full_message)
+            if self.logger.isEnabledFor(logging.ERROR):
+                self.logger.error(message, *args, extra={'context': kwargs, 'context_exception': exception})
         else:
-            print(f"ERROR: {full_message}")
+            print(f"ERROR: {_render(message, args)}{_context_suffix(kwargs, exception)}")
         
         # Track error
-        self.stats['errors'].append({
-            'message': message,
-            'exception': str(exception) if exception else None,
-            'timestamp': datetime.now().isoformat(),
-            'details': kwargs
-        })
-    
-    def critical(self, message: str, exception: Optional[Exception] = None, **kwargs):
-        """Log critical message"""
-        full_message = self._format_message(message, **kwargs)
-        
-        if exception:
-            full_message += f" | Exception: {str(exception)}"
-        
+        self.stats.error_count += 1
+        self.stats.errors.append(self._entry('ERROR', message, args, exception, kwargs))
+    
+    def critical(self, message: str, *args, exception: Optional[Exception] = None, **kwargs):
+        """Log critical message (%-style args are formatted only if the record is emitted)"""
         if self.logger:
-            self.logger.critical(full_message)
+            if self.logger.isEnabledFor(logging.CRITICAL):
+                self.logger.critical(message, *args, extra={'context': kwargs, 'context_exception': exception})
         else:
-            print(f"CRITICAL: {full_message}")
+            print(f"CRITICAL: {_render(message, args)}{_context_suffix(kwargs, exception)}")
         
         # Track critical error
-        self.stats['errors'].append({
-            'message': message,
-            'exception': str(exception) if exception else None,
-            'timestamp': datetime.now().isoformat(),
-            'level': 'CRITICAL',
-            'details': kwargs
-        })
-    
-    def _format_message(self, message: str, **kwargs) -> str:
-        """Format log message with additional context"""
-        if kwargs:
-            context_parts = [f"{k}={v}" for k, v in kwargs.items()]
-            return f"{message} | {' | '.join(context_parts)}"
-        return message
+        self.stats.error_count += 1
+        self.stats.errors.append(self._entry('CRITICAL', message, args, exception, kwargs))
+    
+    @staticmethod
+    def _entry(level: str, message: str, args: tuple, exception: Optional[Exception],
+               details: Dict[str, Any]) -> LogEntry:
+        """Build the tracked stats entry, with the message rendered as it was logged"""
+        return LogEntry(_render(message, args), str(exception) if exception else None,
+                        time.time(), details or _NO_DETAILS, level)
     
     def start_scraping_session(self):
         """Start a new scraping session"""
-        self.stats['start_time'] = datetime.now()
+        self.stats.start_time = time.time()
         self.info("Scraping session started")
     
     def end_scraping_session(self):
         """End scraping session"""
-        self.stats['end_time'] = datetime.now()
+        self.stats.end_time = time.time()
         self.info("Scraping session ended")
         self.log_scraping_stats(self.stats)
     
     def log_request(self, url: str, success: bool, response_time: float = None):
         """Log HTTP request"""
-        self.stats['total_requests'] += 1
+        self.stats.total_requests += 1
         
         if success:
-            self.stats['successful_requests'] += 1
+            self.stats.successful_requests += 1
             self.debug(f"Request successful", url=url, response_time=response_time)
         else:
-            self.stats['failed_requests'] += 1
+            self.stats.failed_requests += 1
             self.warning(f"Request failed", url=url)
     
     def log_page_scraped(self, page_url: str, stocks_found: int):
         """Log page scraping result"""
-        self.stats['pages_scraped'] += 1
-        self.stats['total_stocks_extracted'] += stocks_found
+        self.stats.pages_scraped += 1
+        self.stats.total_stocks_extracted += stocks_found
         self.info(f"Page scraped", url=page_url, stocks_found=stocks_found)
     
-    def log_scraping_stats(self, stats: Dict[str, Any]):
+    def log_scraping_stats(self, stats: ScraperStats):
         """Log comprehensive scraping statistics"""
-        if not stats.get('start_time'):
+        if not stats.start_time:
             return
         
         # Calculate duration
-        end_time = stats.get('end_time') or datetime.now()
-        duration = end_time - stats['start_time']
-        
-        self.info("="*60)
-        self.info("SCRAPING SESSION STATISTICS")
-        self.info("="*60)
+        end_time = stats.end_time or time.time()
+        total_seconds = end_time - stats.start_time
         
-        # Time statistics
-        self.info(f"Session duration: {duration}")
-        self.info(f"Start time: {stats['start_time'].isoformat()}")
-        self.info(f"End time: {end_time.isoformat()}")
-        
-        # Request statistics
-        self.info(f"Total requests: {stats['total_requests']}")
-        self.info(f"Successful requests: {stats['successful_requests']}")
-        self.info(f"Failed requests: {stats['failed_requests']}")
+        lines = [
+            _BANNER,
+            "SCRAPING SESSION STATISTICS",
+            _BANNER,
+            
+            # Time statistics
+            f"Session duration: {timedelta(seconds=total_seconds)}",
+            f"Start time: {_iso(stats.start_time)}",
+            f"End time: {_iso(end_time)}",
+            
+            # Request statistics
+            f"Total requests: {stats.total_requests}",
+            f"Successful requests: {stats.successful_requests}",
+            f"Failed requests: {stats.failed_requests}",
+        ]
         
-        if stats['total_requests'] > 0:
-            success_rate = (stats['successful_requests'] / stats['total_requests']) * 100
-            self.info(f"Request success rate: {success_rate:.1f}%")
+        if stats.total_requests > 0:
+            success_rate = (stats.successful_requests / stats.total_requests) * 100
+            lines.append(f"Request success rate: {success_rate:.1f}%")
         
         # Scraping statistics
-        self.info(f"Pages scraped: {stats['pages_scraped']}")
-        self.info(f"Total stocks extracted: {stats['total_stocks_extracted']}")
+        lines.append(f"Pages scraped: {stats.pages_scraped}")
+        lines.append(f"Total stocks extracted: {stats.total_stocks_extracted}")
         
-        if stats['pages_scraped'] > 0:
-            avg_stocks_per_page = stats['total_stocks_extracted'] / stats['pages_scraped']
-            self.info(f"Average stocks per page: {avg_stocks_per_page:.1f}")
+        if stats.pages_scraped > 0:
+            avg_stocks_per_page = stats.total_stocks_extracted / stats.pages_scraped
+            lines.append(f"Average stocks per page: {avg_stocks_per_page:.1f}")
         
         # Performance statistics
-        total_seconds = duration.total_seconds()
         if total_seconds > 0:
-            stocks_per_second = stats['total_stocks_extracted'] / total_seconds
-            self.info(f"Extraction rate: {stocks_per_second:.2f} stocks/second")
+            stocks_per_second = stats.total_stocks_extracted / total_seconds
+            lines.append(f"Extraction rate: {stocks_per_second:.2f} stocks/second")
         
         # Error statistics
-        self.info(f"Errors encountered: {len(stats['errors'])}")
-        self.info(f"Warnings encountered: {len(stats['warnings'])}")
+        lines.append(f"Errors encountered: {stats.error_count}")
+        lines.append(f"Warnings encountered: {stats.warning_count}")
         
         # Log recent errors
-        if stats['errors']:
-            self.info("Recent errors:")
-            for error in stats['errors'][-5:]:  # Last 5 errors
-                self.info(f"  - {error['message']} ({error['timestamp']})")
+        if stats.errors:
+            lines.append("Recent errors:")
+            for error in list(stats.errors)[-5:]:  # Last 5 errors
+                lines.append(f"  - {error.message} ({_iso(error.timestamp)})")
+        
+        lines.append(_BANNER)
         
-        self.info("="*60)
+        # One record for the whole report instead of one handler round per line
+        self.info("\n".join(lines))
     
     def log_export_result(self, filepath: str, stock_count: int, file_size: int):
         """Log CSV export result"""
@@ -294,12 +477,20 @@ class ScraperLogger:
     
     def get_stats_summary(self) -> Dict[str, Any]:
         """Get current statistics summary"""
-        stats = self.stats.copy()
+        # Shallow field copy; dataclasses.asdict would deep-copy every tracked entry
+        stats = {field.name: getattr(self.stats, field.name) for field in dataclasses.fields(self.stats)}
+        stats['errors'] = [_entry_dict(entry) for entry in stats['errors']]
+        stats['warnings'] = [_entry_dict(entry) for entry in stats['warnings']]
         
         # Add calculated fields
         if stats['start_time']:
-            end_time = stats.get('end_time') or datetime.now()
-            stats['duration_seconds'] = (end_time - stats['start_time']).total_seconds()
+            end_time = stats.get('end_time') or time.time()
+            stats['duration_seconds'] = end_time - stats['start_time']
+        
+        # Times are tracked as epoch floats but reported as datetimes, as before
+        for key in ('start_time', 'end_time'):
+            if stats[key] is not None:
+                stats[key] = datetime.fromtimestamp(stats[key])
         
         if stats['total_requests'] > 0:
             stats['success_rate'] = (stats['successful_requests'] / stats['total_requests']) * 100
@@ -308,14 +499,28 @@ class ScraperLogger:
     
     def reset_stats(self):
         """Reset statistics for new session"""
-        self.stats = {
-            'start_time': None,
-            'end_time': None,
-            'total_requests': 0,
-            'successful_requests': 0,
-            'failed_requests': 0,
-            'total_stocks_extracted': 0,
-            'pages_scraped': 0,
-            'errors': [],
-            'warnings': []
-        }
\ No newline at end of file
+        self.stats = ScraperStats()
+
+
+# Every ScraperLogger, so the fork and exit hooks below are registered once for all of them
+_LIVE_LOGGERS = weakref.WeakSet()
+
+
+def _flush_all_before_fork():
+    for scraper_logger in list(_LIVE_LOGGERS):
+        scraper_logger._flush_before_fork()
+
+
+def _write_all_directly_after_fork():
+    for scraper_logger in list(_LIVE_LOGGERS):
+        scraper_logger._write_directly_after_fork()
+
+
+def _shutdown_all():
+    for scraper_logger in list(_LIVE_LOGGERS):
+        scraper_logger.shutdown()
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(before=_flush_all_before_fork, after_in_child=_write_all_directly_after_fork)
+atexit.register(_shutdown_all)
\ No newline at end of file
@@ -0,0 +1,69 @@
+import json
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from src.config.manager import ConfigManager
+from src.utils.errors import ConfigurationError
+
+
+class TestConfigCache(unittest.TestCase):
+    """Config cache hits and what apply_overrides invalidates"""
+    
+    def setUp(self):
+        ConfigManager.clear_cache()
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.config_path = os.path.join(self.tmpdir.name, 'config.json')
+        with open(self.config_path, 'w') as f:
+            json.dump({'scraping': {'timeout': 12}}, f)
+        
+        # Populate the cache with a first load of the file
+        ConfigManager(self.config_path).load_config()
+    
+    def tearDown(self):
+        ConfigManager.clear_cache()
+        self.tmpdir.cleanup()
+    
+    def _cached_manager(self) -> ConfigManager:
+        """A manager whose load is served from the cache, without reading the file"""
+        manager = ConfigManager(self.config_path)
+        with mock.patch.object(ConfigManager, '_load_from_file') as load_from_file:
+            config = manager.load_config()
+        load_from_file.assert_not_called()
+        self.assertEqual(config['scraping']['timeout'], 12)
+        return manager
+    
+    def test_overrides_invalidate_app_config(self):
+        manager = self._cached_manager()
+        self.assertEqual(manager.get_app_config().scraping.timeout, 12)
+        
+        manager.apply_overrides({'scraping': {'timeout': 5}})
+        
+        self.assertEqual(manager.get_app_config().scraping.timeout, 5)
+    
+    def test_overridden_config_is_validated_again(self):
+        manager = self._cached_manager()
+        
+        manager.apply_overrides({'scraping': {'timeout': -1}})
+        
+        with self.assertRaises(ConfigurationError):
+            manager.validate_config(manager._config_data)
+    
+    def test_mutated_cache_hit_is_validated_again(self):
+        manager = ConfigManager(self.config_path)
+        config = manager.load_config()
+        
+        config['scraping']['timeout'] = -1
+        
+        with self.assertRaises(ConfigurationError):
+            manager.validate_config(config)
+    
+    def test_overrides_do_not_leak_into_cache(self):
+        self._cached_manager().apply_overrides({'scraping': {'timeout': 5}})
+        
+        self._cached_manager()
+
+
+if __name__ == '__main__':
+    unittest.main()
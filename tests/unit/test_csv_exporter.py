@@ -0,0 +1,73 @@
+import os
+import tempfile
+import unittest
+from datetime import datetime
+
+from src.models.stock_data import StockData
+from src.exporters.csv_exporter import CSVExporter
+
+
+class TestCSVExport(unittest.TestCase):
+    """Byte-level checks of the CSV export format"""
+    
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.exporter = CSVExporter(output_directory=self.tmpdir.name)
+        self.path = os.path.join(self.tmpdir.name, 'out.csv')
+        self.timestamp = datetime(2024, 1, 2, 3, 4, 5)
+    
+    def tearDown(self):
+        self.tmpdir.cleanup()
+    
+    def _export_bytes(self, stocks) -> bytes:
+        self.exporter.export(stocks, self.path)
+        with open(self.path, 'rb') as f:
+            return f.read()
+    
+    def test_quoting_missing_values_and_line_endings(self):
+        stocks = [
+            StockData("AAPL", 'Apple, "Inc"', 189.5, 1.234, -2.0, self.timestamp, 'success'),
+            StockData("BRK.B", None, 401.0, None, None, self.timestamp, 'partial'),
+        ]
+        
+        self.assertEqual(
+            self._export_bytes(stocks),
+            b'symbol,company_name,price,change_percent,change_absolute,timestamp,status\r\n'
+            b'AAPL,"Apple, ""Inc""",189.50,1.23%,-2.00,2024-01-02T03:04:05,success\r\n'
+            b'BRK.B,N/A,401.00,N/A,N/A,2024-01-02T03:04:05,partial\r\n'
+        )
+    
+    def test_non_numeric_value_is_written_as_na(self):
+        stocks = [StockData.unchecked("MSFT", "Microsoft", 400, 1, "x", self.timestamp)]
+        
+        self.assertEqual(
+            self._export_bytes(stocks),
+            b'symbol,company_name,price,change_percent,change_absolute,timestamp,status\r\n'
+            b'MSFT,Microsoft,400.00,1.00%,N/A,2024-01-02T03:04:05,success\r\n'
+        )
+    
+    def test_summary_counts_records_not_lines(self):
+        stocks = [
+            StockData("AAPL", 'Apple\r\nInc', 189.5, None, None, self.timestamp),
+            StockData("MSFT", 'Micro "soft"\nCorp', 400.0, None, None, self.timestamp),
+            StockData("IBM", 'IBM', 150.0, None, None, self.timestamp),
+        ]
+        self.exporter.export(stocks, self.path)
+        
+        self.assertEqual(self.exporter.get_export_summary(self.path)['row_count'], 3)
+    
+    def test_export_recreates_deleted_output_directory(self):
+        output_directory = os.path.join(self.tmpdir.name, 'exports')
+        CSVExporter(output_directory=output_directory)
+        os.rmdir(output_directory)
+        
+        # A later exporter for the same directory must not trust the process-wide record
+        exporter = CSVExporter(output_directory=output_directory)
+        exporter.export([StockData("AAPL", "Apple", 1.0, None, None, self.timestamp)],
+                        os.path.join(output_directory, 'out.csv'))
+        
+        self.assertTrue(os.path.isfile(os.path.join(output_directory, 'out.csv')))
+
+
+if __name__ == '__main__':
+    unittest.main()
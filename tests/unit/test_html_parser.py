@@ -0,0 +1,43 @@
+import unittest
+
+from src.parsers.html_parser import HTMLParser
+
+
+PAGE = (
+    "<html><head><title>Quotes</title></head><body>"
+    "<div class='pager'><a href='?page=2'>2</a></div>"
+    "<table class='tab01'>"
+    "<tr><th>Symbol</th><th>Name</th><th>Last</th><th>Change</th></tr>"
+    "<tr><td>AAPL</td><td>Apple</td><td>189.50</td><td>+1.20</td></tr>"
+    "<tr><td>MSFT</td><td>Microsoft</td><td>400.00</td><td>-0.50</td></tr>"
+    "</table></body></html>"
+)
+
+
+class TestParseStockTable(unittest.TestCase):
+    """parse_stock_table reads only tables and leaves the current document alone"""
+    
+    def setUp(self):
+        self.parser = HTMLParser()
+    
+    def test_rows_are_found(self):
+        rows = self.parser.parse_stock_table(PAGE)
+        self.assertEqual([row.find('td').get_text() for row in rows], ['AAPL', 'MSFT'])
+    
+    def test_current_document_keeps_non_table_elements(self):
+        self.parser.parse_html(PAGE)
+        
+        self.parser.parse_stock_table(PAGE)
+        
+        self.assertTrue(self.parser.wait_for_element('title'))
+        self.assertIsNotNone(self.parser.find_element_by_multiple_selectors(['div.pager a']))
+    
+    def test_without_parse_html_there_is_no_current_document(self):
+        self.parser.parse_stock_table(PAGE)
+        
+        self.assertIsNone(self.parser.soup)
+        self.assertEqual(self.parser.get_table_structure_info(), {})
+
+
+if __name__ == '__main__':
+    unittest.main()
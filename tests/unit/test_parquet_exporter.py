@@ -0,0 +1,68 @@
+import os
+import tempfile
+import unittest
+from datetime import datetime
+
+from src.models.stock_data import StockData
+from src.exporters.csv_exporter import CSVExporter
+from src.utils.errors import ExportError
+
+try:
+    import pyarrow.parquet as pq
+    from src.exporters.parquet_exporter import ParquetExporter
+except ImportError:  # Parquet export is optional
+    pq = None
+
+
+@unittest.skipIf(pq is None, "pyarrow not installed")
+class TestParquetExport(unittest.TestCase):
+    """Parquet exports go through the same row validation as CSV"""
+    
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.exporter = ParquetExporter(output_directory=self.tmpdir.name)
+        self.path = os.path.join(self.tmpdir.name, 'out.parquet')
+        self.timestamp = datetime(2024, 1, 2, 3, 4, 5)
+    
+    def tearDown(self):
+        self.tmpdir.cleanup()
+    
+    def _stocks(self):
+        return [
+            StockData.unchecked("TOOLONGSYMBOLXX", "Too Long", 10.0, None, None, self.timestamp),
+            StockData.unchecked(" msft ", " Microsoft ", 999999, 1.5, None, None, None),
+            StockData("AAPL", "Apple", 189.5, 1.2, 2.0, self.timestamp, 'success'),
+        ]
+    
+    def test_invalid_rows_are_dropped_and_missing_fields_defaulted(self):
+        self.assertEqual(self.exporter.export(self._stocks(), self.path), 2)
+        
+        rows = pq.read_table(self.path).to_pylist()
+        self.assertEqual([row['symbol'] for row in rows], ['MSFT', 'AAPL'])
+        
+        msft = rows[0]
+        self.assertEqual(msft['company_name'], 'Microsoft')
+        self.assertIsNone(msft['price'])
+        self.assertEqual(msft['status'], 'partial')
+        self.assertIsInstance(msft['timestamp'], datetime)
+    
+    def test_same_rows_as_csv(self):
+        self.exporter.export(self._stocks(), self.path)
+        csv_path = os.path.join(self.tmpdir.name, 'out.csv')
+        CSVExporter(output_directory=self.tmpdir.name).export(self._stocks(), csv_path)
+        
+        with open(csv_path) as f:
+            csv_symbols = [line.split(',')[0] for line in f.read().splitlines()[1:]]
+        parquet_symbols = pq.read_table(self.path).column('symbol').to_pylist()
+        self.assertEqual(parquet_symbols, csv_symbols)
+    
+    def test_no_valid_rows_raises(self):
+        stocks = [StockData.unchecked("TOOLONGSYMBOLXX", None, 1.0, None, None, self.timestamp)]
+        
+        with self.assertRaises(ExportError):
+            self.exporter.export(stocks, self.path)
+        self.assertFalse(os.path.exists(self.path))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,61 @@
+import asyncio
+import unittest
+from unittest import mock
+
+from src.scraper import stooq_scraper
+from src.scraper.stooq_scraper import StooqScraper
+
+
+# Enough placeholder results for any source to be accepted
+ENOUGH_STOCKS = [object()] * 150
+
+
+class TestFetchOrder(unittest.TestCase):
+    """Order in which fetch_data and fetch_data_async try their sources"""
+    
+    def setUp(self):
+        self.scraper = StooqScraper()
+        self.calls = []
+        
+        # Every source records its call; http_result decides whether the plain HTTP source suffices
+        self.http_result = ENOUGH_STOCKS
+        self._patch('_try_simple_scraping', lambda: self._record('simple', self.http_result))
+        self._patch('_selenium_scraping_intensive', lambda: self._record('selenium', ENOUGH_STOCKS))
+        self._patch('_try_concurrent_scraping',
+                    mock.AsyncMock(side_effect=lambda: self._record('concurrent', self.http_result)))
+    
+    def tearDown(self):
+        self.scraper.close()
+    
+    def _patch(self, name, replacement):
+        patcher = mock.patch.object(self.scraper, name, replacement)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+    
+    def _record(self, source, result):
+        self.calls.append(source)
+        return result
+    
+    def test_sync_path_tries_simple_scraping_first(self):
+        self.assertIs(self.scraper.fetch_data(), ENOUGH_STOCKS)
+        self.assertEqual(self.calls, ['simple'])
+    
+    def test_sync_path_falls_back_to_selenium(self):
+        self.http_result = None
+        self.scraper.fetch_data()
+        self.assertEqual(self.calls, ['simple', 'selenium'])
+    
+    @unittest.skipIf(stooq_scraper.aiohttp is None, "aiohttp not installed")
+    def test_async_path_tries_concurrent_scraping_first(self):
+        self.assertIs(asyncio.run(self.scraper.fetch_data_async()), ENOUGH_STOCKS)
+        self.assertEqual(self.calls, ['concurrent'])
+    
+    @unittest.skipIf(stooq_scraper.aiohttp is None, "aiohttp not installed")
+    def test_async_path_falls_back_to_selenium(self):
+        self.http_result = None
+        asyncio.run(self.scraper.fetch_data_async())
+        self.assertEqual(self.calls, ['concurrent', 'selenium'])
+
+
+if __name__ == '__main__':
+    unittest.main()